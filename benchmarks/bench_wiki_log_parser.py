@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Microbenchmark for the wiki `git log --name-status` parser in scripts/write_issue_report.py.
+# A synthetic log with one page change per commit is parsed in memory and the per-line cost is
+# reported for the `git log -z` output the script requests, next to the previous line-based parser
+# that matched each header with up to three regexes.
+#   python benchmarks/bench_wiki_log_parser.py --commits 100000
+import argparse
+import codecs
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = REPO_ROOT / 'scripts' / 'write_issue_report.py'
+
+
+def load_script_helpers():
+    # The script runs on import, so only the helper definitions above its entry point are executed.
+    source = SCRIPT_PATH.read_text(encoding='utf-8')
+    source = source[:source.index("print('Starting write_issue_report.py')")]
+    namespace = {'__name__': 'write_issue_report_helpers'}
+    exec(compile(source, str(SCRIPT_PATH), 'exec'), namespace)
+    return namespace
+
+
+def synthetic_log_lines(commits):
+    lines = []
+    for i in range(commits):
+        login = 'member{}'.format(i % 50)
+        fields = ('{:040x}'.format(i + 1), '{}@users.noreply.github.com'.format(login), login, '2026-02-{:02d}'.format(i % 28 + 1), 'Edit page {} | section\tnotes'.format(i))
+        lines.append('|'.join(fields))
+        lines.append('M\tPage-{}.md'.format(i % 1000))
+        lines.append('')
+    return lines
+
+
+def synthetic_z_log_chunks(commits, chunk_size=1 << 16):
+    records = []
+    for i in range(commits):
+        login = 'member{}'.format(i % 50)
+        fields = ('{:040x}'.format(i + 1), '{}@users.noreply.github.com'.format(login), login, '2026-02-{:02d}'.format(i % 28 + 1), 'Edit page {} | section\tnotes'.format(i))
+        records.append('\x01{}\nM\x00Page-{}.md\x00\x00'.format('\x00'.join(fields), i % 1000))
+    data = ''.join(records).encode('utf-8')
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def decode_git_path(path_text):
+    # Line-based output quotes and escapes unusual paths; -z output gives them verbatim.
+    if len(path_text) >= 2 and path_text[0] == '"' and path_text[-1] == '"':
+        try:
+            return codecs.escape_decode(path_text[1:-1].encode('utf-8'))[0].decode('utf-8')
+        except Exception:
+            return path_text[1:-1]
+    return path_text
+
+
+def previous_iter_wiki_log_entries(lines):
+    # The parser as it was before header tokenizing: an uncompiled start check, then two full patterns in turn.
+    current_commit = None
+    for line in lines:
+        if re.match(r'^[0-9a-fA-F]{6,40}\|', line):
+            match = re.match(r'^([0-9a-fA-F]{6,40})\|([^|]*)\|([^|]*)\|(\d{4}-\d{2}-\d{2})\|(.*)$', line)
+            if match:
+                current_commit = match.groups()
+            else:
+                match = re.match(r'^([0-9a-fA-F]{6,40})\|([^|]*)\|(\d{4}-\d{2}-\d{2})\|(.*)$', line)
+                if match:
+                    current_commit = (match.group(1), match.group(2), '', match.group(3), match.group(4))
+        elif line.strip() and current_commit:
+            parts = line.strip().split('\t')
+            if len(parts) >= 2:
+                status = parts[0]
+                filename = parts[-1] if (status.startswith('R') or status.startswith('C')) and len(parts) >= 3 else parts[1]
+                yield current_commit + (status, decode_git_path(filename))
+
+
+# ns_per_line is always relative to the line-based log; the -z figures also include splitting and decoding the raw bytes.
+def time_parser(parse, log, line_count, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = sum(1 for _ in parse(log))
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        'entries': count,
+        'best_sec': round(best, 4),
+        'median_sec': round(statistics.median(timings), 4),
+        'ns_per_line': round(best / line_count * 1e9, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the wiki git log parser on a synthetic log.')
+    parser.add_argument('--commits', type=int, default=100000, help='commits in the synthetic log')
+    parser.add_argument('--repeat', type=int, default=5, help='timed passes per parser; the best is reported per line')
+    args = parser.parse_args()
+
+    helpers = load_script_helpers()
+    z_chunks = synthetic_z_log_chunks(args.commits)
+    pipe_lines = synthetic_log_lines(args.commits)
+    line_count = len(pipe_lines)
+    results = {
+        'commits': args.commits,
+        'lines': line_count,
+        'parsers': {
+            'z_output': time_parser(lambda chunks: helpers['iter_wiki_log_z_entries'](helpers['iter_split_bytes'](chunks, b'\x00')), z_chunks, line_count, args.repeat),
+            'previous_pipe_headers': time_parser(previous_iter_wiki_log_entries, pipe_lines, line_count, args.repeat),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# Offline benchmark for scripts/write_issue_report.py.
+# gh and git are replaced by stubs serving a synthetic repository from fixture files, so runs are
+# reproducible and need no network. Results are written as JSON to compare between commits, e.g.
+#   python benchmarks/bench_write_issue_report.py --open-issues 20000 --output before.json
+#   python benchmarks/bench_write_issue_report.py --open-issues 20000 --compare before.json
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = REPO_ROOT / 'scripts' / 'write_issue_report.py'
+BENCH_NOW = datetime.datetime(2026, 2, 10, 12, 0, 0)
+BENCH_REPO_URL = 'https://github.com/example/repo'
+PHASES = ('ingest', 'issue_scan', 'reaction_lookups', 'wiki_log', 'rendering')
+
+
+# Both stubs log "<unix time>\t<json args>" per call so phases can be located on the same clock as the script output.
+STUB_PRELUDE = """#!/usr/bin/env python3
+import json
+import os
+import re
+import sys
+import time
+
+args = sys.argv[1:]
+fixture_dir = os.environ['BENCH_FIXTURE_DIR']
+with open(os.environ['BENCH_CALL_LOG'], 'a', encoding='utf-8') as fh:
+    fh.write('{}\\t{}\\n'.format(time.time(), json.dumps([os.path.basename(sys.argv[0])] + args)))
+latency = float(os.environ.get('BENCH_STUB_LATENCY_MS', '0')) / 1000.0
+if latency:
+    time.sleep(latency)
+
+
+def load_fixture(name):
+    with open(os.path.join(fixture_dir, name), encoding='utf-8') as fh:
+        return json.load(fh)
+"""
+
+
+GH_STUB = STUB_PRELUDE + """
+PAGE_SIZE = 100
+
+
+def comment_connection(comments, start):
+    page = comments[start:start + PAGE_SIZE]
+    has_next = start + PAGE_SIZE < len(comments)
+    return {'pageInfo': {'hasNextPage': has_next, 'endCursor': str(start + PAGE_SIZE) if has_next else None}, 'nodes': page}
+
+
+if args[:2] == ['issue', 'list']:
+    # Honors the updated: range and --limit so that split searches see the same subsets as on GitHub.
+    lower, upper = re.search(r'updated:(\\S+)\\.\\.(\\S+)', args[args.index('--search') + 1]).groups()
+    lower = lower + 'T00:00:00Z' if len(lower) == 10 else lower
+    upper = upper + 'T23:59:59Z' if len(upper) == 10 else upper
+    limit = int(args[args.index('--limit') + 1])
+    with open(os.path.join(fixture_dir, 'recent_issues.tsv'), encoding='utf-8') as fh:
+        matches = [line for line in fh if lower <= line.rstrip('\\n').split('\\t')[1] <= upper]
+    sys.stdout.write(''.join(matches[:limit]))
+    sys.exit(0)
+
+if args[:2] == ['issue', 'view']:
+    node = load_fixture('issues.json').get(args[2])
+    if node is None:
+        sys.stderr.write('issue not found\\n')
+        sys.exit(1)
+    view = dict(node)
+    view['labels'] = node['labels']['nodes']
+    # gh issue view has reactionGroups only; the reactions connections are for the GraphQL batches.
+    view.pop('reactions', None)
+    view['comments'] = [{key: value for key, value in comment.items() if key != 'reactions'} for comment in node['comments']]
+    sys.stdout.write(json.dumps(view) + '\\n')
+    sys.exit(0)
+
+if args[:2] == ['api', 'graphql']:
+    query = next(arg[len('query='):] for arg in args if arg.startswith('query='))
+    fields = dict(arg.split('=', 1) for arg in args if '=' in arg and not arg.startswith('query='))
+    issues = load_fixture('issues.json')
+    if 'query IssueComments' in query:
+        node = issues[fields['number']]
+        data = {'repository': {'issue': {'comments': comment_connection(node['comments'], int(fields['cursor']))}}}
+    else:
+        repository = {}
+        for alias, number in re.findall(r'(i\\d+): issue\\(number: (\\d+)\\)', query):
+            node = issues.get(number)
+            if node is not None:
+                repository[alias] = dict(node, comments=comment_connection(node['comments'], 0))
+        data = {'repository': repository}
+    sys.stdout.write(json.dumps({'data': data}) + '\\n')
+    sys.exit(0)
+
+if args[:1] == ['api'] and args[1].endswith('/reactions'):
+    if '-i' in args:
+        sys.stdout.write('HTTP/2.0 200 OK\\r\\nEtag: "bench"\\r\\n\\r\\n')
+    for reaction in load_fixture('reactions.json'):
+        sys.stdout.write(json.dumps(reaction) + '\\n')
+    sys.exit(0)
+
+sys.stderr.write('unsupported gh call: {}\\n'.format(' '.join(args)))
+sys.exit(1)
+"""
+
+
+GIT_STUB = STUB_PRELUDE + """
+if args[:1] == ['clone']:
+    os.makedirs(args[-1], exist_ok=True)
+    sys.exit(0)
+
+if len(args) >= 3 and args[0] == '-C' and args[2] == 'log':
+    with open(os.path.join(fixture_dir, 'wiki_log.txt'), encoding='utf-8') as fh:
+        sys.stdout.write(fh.read())
+    sys.exit(0)
+
+sys.exit(0)
+"""
+
+
+def iso(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def write_fixtures(work, params):
+    rng = random.Random(params['seed'])
+    fixture_dir = work / 'fixtures'
+    fixture_dir.mkdir()
+    logins = ['member{}'.format(i) for i in range(params['members'])]
+    labels = ['label{}'.format(i) for i in range(10)]
+
+    # Open issue listing (input file): most issues are old enough to be reported as inactive.
+    with open(work / 'gh_out.ndjson', 'w', encoding='utf-8') as fh:
+        for number in range(1, params['open_issues'] + 1):
+            updated_at = BENCH_NOW - datetime.timedelta(days=rng.randint(0, 400), seconds=rng.randint(0, 86399))
+            fh.write(json.dumps({
+                'number': number,
+                'assignees': [{'login': login} for login in rng.sample(logins, rng.randint(0, min(3, len(logins))))],
+                'updatedAt': iso(updated_at),
+                'url': '{}/issues/{}'.format(BENCH_REPO_URL, number),
+                'title': 'Synthetic issue {}'.format(number),
+                'labels': [{'name': name} for name in rng.sample(labels, rng.randint(0, 3))],
+            }) + '\n')
+
+    # Recently updated issues with comments; every issue and comment carries reactions when R > 0.
+    reactions = [
+        {'content': '+1', 'created_at': iso(BENCH_NOW - datetime.timedelta(hours=i + 1)), 'user': {'login': logins[i % len(logins)]}}
+        for i in range(params['reactions'])
+    ]
+    reaction_groups = [{'content': 'THUMBS_UP', 'users': {'totalCount': params['reactions']}}]
+    # The same reactions inline, as GraphQL issue batches return them.
+    reaction_connection = {
+        'pageInfo': {'hasNextPage': False},
+        'nodes': [{'createdAt': reaction['created_at'], 'user': reaction['user']} for reaction in reactions],
+    }
+    issues = {}
+    recent_lines = []
+    comment_id = 1000000
+    for number in range(1, params['recent_issues'] + 1):
+        created_at = BENCH_NOW - datetime.timedelta(days=rng.randint(0, 6), seconds=rng.randint(0, 86399))
+        comments = []
+        for _ in range(params['comments']):
+            comment_id += 1
+            comments.append({
+                'databaseId': comment_id,
+                'url': '{}/issues/{}#issuecomment-{}'.format(BENCH_REPO_URL, number, comment_id),
+                'createdAt': iso(created_at + datetime.timedelta(minutes=rng.randint(1, 600))),
+                'author': {'login': rng.choice(logins)},
+                'reactionGroups': reaction_groups if params['reactions'] else [],
+                'reactions': reaction_connection,
+            })
+        issues[str(number)] = {
+            'number': number,
+            'createdAt': iso(created_at),
+            'updatedAt': iso(BENCH_NOW - datetime.timedelta(seconds=3600 + number * 7919 % (6 * 86400))),
+            'url': '{}/issues/{}'.format(BENCH_REPO_URL, number),
+            'title': 'Synthetic issue {}'.format(number),
+            'author': {'login': rng.choice(logins)},
+            'labels': {'nodes': []},
+            'reactionGroups': reaction_groups if params['reactions'] else [],
+            'reactions': reaction_connection,
+            'comments': comments,
+        }
+        recent_lines.append('{}\t{}\n'.format(number, issues[str(number)]['updatedAt']))
+    (fixture_dir / 'issues.json').write_text(json.dumps(issues), encoding='utf-8')
+    (fixture_dir / 'recent_issues.tsv').write_text(''.join(recent_lines), encoding='utf-8')
+    (fixture_dir / 'reactions.json').write_text(json.dumps(reactions), encoding='utf-8')
+
+    wiki_lines = []
+    for i in range(params['wiki_commits']):
+        login = rng.choice(logins)
+        commit_date = (BENCH_NOW - datetime.timedelta(days=rng.randint(0, 6))).strftime('%Y-%m-%d')
+        wiki_lines.append('\x01{:040x}\x00{}@users.noreply.github.com\x00{}\x00{}\x00Edit page {}\n'.format(i + 1, login, login, commit_date, i))
+        wiki_lines.append('M\x00Page-{}.md\x00\x00'.format(rng.randint(0, max(1, params['wiki_commits'] // 4))))
+    (fixture_dir / 'wiki_log.txt').write_text(''.join(wiki_lines), encoding='utf-8')
+    return fixture_dir
+
+
+def read_call_log(path):
+    calls = []
+    if path.exists():
+        for line in path.read_text(encoding='utf-8').splitlines():
+            timestamp, args = line.split('\t', 1)
+            calls.append((float(timestamp), json.loads(args)))
+    return calls
+
+
+def run_once(work, fixture_dir, params, extra_env):
+    bin_dir = work / 'bin'
+    call_log = work / 'calls.log'
+    if call_log.exists():
+        call_log.unlink()
+    env = os.environ.copy()
+    env.update({
+        'PATH': '{}{}{}'.format(bin_dir, os.pathsep, env.get('PATH', '')),
+        'PYTHONUNBUFFERED': '1',
+        'WRITE_ISSUE_REPORT_NOW': iso(BENCH_NOW),
+        'BENCH_FIXTURE_DIR': str(fixture_dir),
+        'BENCH_CALL_LOG': str(call_log),
+        'BENCH_STUB_LATENCY_MS': str(params['stub_latency_ms']),
+    })
+    env.update(extra_env)
+    command = [sys.executable, str(SCRIPT_PATH), 'gh_out.ndjson', '30', 'weekly_forum', 'no', BENCH_REPO_URL]
+
+    # Each output line is stamped on arrival to mark phase boundaries.
+    marks = {}
+    start = time.time()
+    proc = subprocess.Popen(command, cwd=work, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in proc.stdout:
+        now = time.time()
+        if line.startswith('Number of open Issues:'):
+            marks.setdefault('ingest_end', now)
+        elif 'wiki repository' in line:
+            marks.setdefault('wiki_start', now)
+        elif line.startswith('Found ') and 'wiki page updates' in line:
+            marks.setdefault('wiki_end', now)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    end = time.time()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise SystemExit('write_issue_report.py exited with {}'.format(proc.returncode))
+
+    calls = read_call_log(call_log)
+    reaction_times = [t for t, args in calls if args[:2] == ['gh', 'api'] and args[2].endswith('/reactions')]
+    ingest_end = marks.get('ingest_end', start)
+    wiki_start = marks.get('wiki_start', end)
+    wiki_end = marks.get('wiki_end', wiki_start)
+    reaction_start = reaction_times[0] if reaction_times else wiki_start
+    boundaries = [start, ingest_end, reaction_start, wiki_start, wiki_end, end]
+    return {
+        'wall_sec': end - start,
+        'phases_sec': {phase: max(0.0, boundaries[i + 1] - boundaries[i]) for i, phase in enumerate(PHASES)},
+        'gh_calls': sum(1 for _, args in calls if args[0] == 'gh'),
+        'git_calls': sum(1 for _, args in calls if args[0] == 'git'),
+        # ru_maxrss is in KiB on Linux (bytes on macOS) and covers the script and the stubs it waited for.
+        'peak_rss_kb': rusage.ru_maxrss,
+        # Phase and per-command timings recorded by the script itself.
+        'script_metrics': json.loads((work / 'report_metrics.json').read_text(encoding='utf-8')),
+    }
+
+
+def summarize(runs):
+    return {
+        'wall_sec': statistics.median(run['wall_sec'] for run in runs),
+        'phases_sec': {phase: statistics.median(run['phases_sec'][phase] for run in runs) for phase in PHASES},
+        'gh_calls': runs[-1]['gh_calls'],
+        'git_calls': runs[-1]['git_calls'],
+        'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+    }
+
+
+def git_revision():
+    result = subprocess.run(['git', '-C', str(REPO_ROOT), 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return result.stdout.strip() if result.returncode == 0 else ''
+
+
+def print_comparison(summary, baseline_path):
+    with open(baseline_path, encoding='utf-8') as fh:
+        baseline = json.load(fh)['summary']
+    rows = [('wall_sec', baseline['wall_sec'], summary['wall_sec'])]
+    rows += [(phase, baseline['phases_sec'][phase], summary['phases_sec'][phase]) for phase in PHASES]
+    rows += [(key, baseline[key], summary[key]) for key in ('gh_calls', 'git_calls', 'peak_rss_kb')]
+    print('{:<18} {:>12} {:>12} {:>8}'.format('metric', 'baseline', 'current', 'ratio'))
+    for name, before, after in rows:
+        ratio = '{:.2f}x'.format(after / before) if before else '-'
+        print('{:<18} {:>12.3f} {:>12.3f} {:>8}'.format(name, before, after, ratio))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark write_issue_report.py against a synthetic repository.')
+    parser.add_argument('--open-issues', type=int, default=2000, help='N: open issues in the input listing')
+    parser.add_argument('--recent-issues', type=int, default=100, help='M: issues updated within the report window')
+    parser.add_argument('--comments', type=int, default=5, help='K: comments per recent issue')
+    parser.add_argument('--reactions', type=int, default=2, help='R: reactions per recent issue and comment')
+    parser.add_argument('--wiki-commits', type=int, default=50, help='W: wiki commits within the report window')
+    parser.add_argument('--members', type=int, default=30, help='size of the assignee/author pool')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per configuration; the summary uses medians')
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0, help='sleep added to every gh/git call')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE', help='extra environment for the script')
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    parser.add_argument('--compare', help='results JSON from an earlier run to compare against')
+    args = parser.parse_args()
+
+    params = {
+        'open_issues': args.open_issues,
+        'recent_issues': args.recent_issues,
+        'comments': args.comments,
+        'reactions': args.reactions,
+        'wiki_commits': args.wiki_commits,
+        'members': max(1, args.members),
+        'stub_latency_ms': args.stub_latency_ms,
+        'seed': args.seed,
+    }
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    with tempfile.TemporaryDirectory(prefix='bench_write_issue_report.') as tmpdir:
+        work = Path(tmpdir)
+        bin_dir = work / 'bin'
+        bin_dir.mkdir()
+        for name, contents in (('gh', GH_STUB), ('git', GIT_STUB)):
+            (bin_dir / name).write_text(contents, encoding='utf-8')
+            (bin_dir / name).chmod(0o755)
+        fixture_dir = write_fixtures(work, params)
+        runs = []
+        for _ in range(max(1, args.repeat)):
+            # Every run clones the wiki afresh, like the workflow does.
+            shutil.rmtree(work / 'wiki_temp', ignore_errors=True)
+            runs.append(run_once(work, fixture_dir, params, extra_env))
+
+    results = {
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'params': params,
+        'env': extra_env,
+        'runs': runs,
+        'summary': summarize(runs),
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        print_comparison(results['summary'], args.compare)
+
+
+if __name__ == '__main__':
+    main()
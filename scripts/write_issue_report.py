@@ -1,14 +1,20 @@
 # NOTE: This script is synced into kfuku52/kflab from kfuku52/kflab-bot.
 # Make changes in kfuku52/kflab-bot and let the sync propagate them.
-import codecs
+import bisect
+import concurrent.futures
 import datetime
 import glob
 import hashlib
+import http.client
 import json
 import os
+import random
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 import urllib.parse
 
@@ -95,38 +101,9 @@ def unique_filename_components(values):
     return filename_map
 
 
-def decode_git_path(path_text):
-    if len(path_text) >= 2 and path_text[0] == '"' and path_text[-1] == '"':
-        try:
-            decoded_bytes = codecs.escape_decode(path_text[1:-1].encode('utf-8'))[0]
-            return decoded_bytes.decode('utf-8')
-        except Exception:
-            return path_text[1:-1]
-    return path_text
-
-
-def parse_wiki_commit_line(line):
-    new_format_match = re.match(r'^([0-9a-fA-F]{6,40})\|([^|]*)\|([^|]*)\|(\d{4}-\d{2}-\d{2})\|(.*)$', line)
-    if new_format_match:
-        return {
-            'hash': new_format_match.group(1),
-            'author_email': new_format_match.group(2),
-            'author_name': new_format_match.group(3),
-            'date': new_format_match.group(4),
-            'message': new_format_match.group(5),
-        }
-
-    old_format_match = re.match(r'^([0-9a-fA-F]{6,40})\|([^|]*)\|(\d{4}-\d{2}-\d{2})\|(.*)$', line)
-    if old_format_match:
-        return {
-            'hash': old_format_match.group(1),
-            'author_email': old_format_match.group(2),
-            'author_name': '',
-            'date': old_format_match.group(3),
-            'message': old_format_match.group(4),
-        }
-
-    return None
+# With `git log -z`, commit headers are written as "\x01%H\0%ae\0%an\0%ad\0%s" and paths come verbatim.
+WIKI_LOG_PRETTY_FORMAT = '--pretty=format:%x01%H%x00%ae%x00%an%x00%ad%x00%s'
+WIKI_COMMIT_HASH_PATTERN = re.compile(r'^[0-9a-fA-F]{6,40}$')
 
 
 def wiki_author_candidates(author_email, author_name):
@@ -158,6 +135,29 @@ def wiki_author_candidates(author_email, author_name):
     return unique_candidates
 
 
+def resolve_wiki_author(author_email, author_name, assignee_lookup, learned_logins):
+    # Returns (author candidates, matched assignee). A match teaches learned_logins the email's login, which
+    # later resolves commits by that email whose name and address do not name the assignee themselves.
+    candidates = wiki_author_candidates(author_email, author_name)
+    email_key = author_email.strip().lower()
+    for candidate in candidates:
+        matched_assignee = assignee_lookup.get(candidate.lower())
+        if matched_assignee:
+            if email_key:
+                learned_logins[email_key] = matched_assignee
+            return candidates, matched_assignee
+    learned_login = learned_logins.get(email_key)
+    return candidates, (assignee_lookup.get(learned_login.lower()) if learned_login else None)
+
+
+def load_wiki_author_logins(path):
+    data = read_json_file(path) if path else None
+    logins = data.get('logins') if isinstance(data, dict) else None
+    if not isinstance(logins, dict):
+        return {}
+    return {email: login for email, login in logins.items() if isinstance(email, str) and isinstance(login, str) and login}
+
+
 def unique_case_insensitive(values):
     canonical = {}
     for value in values:
@@ -175,6 +175,99 @@ def parse_legacy_csv_field(raw_value):
     return ['']
 
 
+JSON_STREAM_CHUNK_SIZE = 1 << 16
+
+
+def iter_json_array(f, head):
+    # Decodes array elements one at a time from `head` (the already-read start of the file, beginning
+    # with '[') followed by the rest of `f`, so the whole listing is never held in memory.
+    decoder = json.JSONDecoder()
+    buffer = head
+    pos = 1
+    expect_value = True
+    is_first = True
+    eof = False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = f.read(JSON_STREAM_CHUNK_SIZE)
+        if chunk:
+            buffer = buffer[pos:] + chunk
+            pos = 0
+        else:
+            eof = True
+
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            read_more()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError('Unterminated array', buffer, pos)
+        if buffer[pos] == ']' and (is_first or not expect_value):
+            pos += 1
+            while True:
+                if buffer[pos:].strip():
+                    raise json.JSONDecodeError('Extra data', buffer, pos)
+                if eof:
+                    return
+                read_more()
+        if expect_value:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+            if end == len(buffer) and not eof:
+                # A number at the end of the buffer may continue in the next chunk.
+                read_more()
+                continue
+            yield value
+            pos = end
+            expect_value = False
+            is_first = False
+        else:
+            if buffer[pos] != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect_value = True
+
+
+def iter_text_lines(head, f):
+    # Lines of `head` followed by the rest of `f`, without reading the whole file at once.
+    pending = head
+    for chunk in iter(lambda: f.read(JSON_STREAM_CHUNK_SIZE), ''):
+        pending += chunk
+        lines = pending.split('\n')
+        pending = lines.pop()
+        yield from lines
+    yield from pending.split('\n')
+
+
+def detect_issue_input_format(head, path):
+    stripped = head.lstrip()
+    # An array is never valid NDJSON, so it is read as one whatever the extension says.
+    if stripped.startswith('['):
+        return 'json_array'
+    if path.lower().endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if not stripped.startswith('{'):
+        return 'legacy'
+    # One object per line is NDJSON (`gh ... --jq '.[]'`); a lone object in a .json file is a wrong root.
+    first_line, _, rest = stripped.partition('\n')
+    try:
+        first_record = json.loads(first_line)
+    except ValueError:
+        return 'json_object'
+    if isinstance(first_record, dict) and (rest.strip() or not path.lower().endswith('.json')):
+        return 'ndjson'
+    return 'json_object'
+
+
 def extract_assignee_logins(raw_assignees):
     if isinstance(raw_assignees, (dict, str)):
         raw_assignees = [raw_assignees]
@@ -234,6 +327,49 @@ def extract_label_names(raw_labels):
     return labels
 
 
+class IssueRecord:
+    # One open issue from gh_out. Lowercased label and assignee sets are built once so filtering is set lookups.
+    __slots__ = (
+        'issue_number', 'assignees', 'relative_time_updated', 'unix_timestamp_updated',
+        'issue_title', 'issue_url', 'labels', 'label_keys', 'assignee_keys',
+    )
+
+    def __init__(self, issue_number, assignees, relative_time_updated, unix_timestamp_updated, issue_title, issue_url, labels):
+        self.issue_number = issue_number
+        self.assignees = assignees
+        self.relative_time_updated = relative_time_updated
+        self.unix_timestamp_updated = unix_timestamp_updated
+        self.issue_title = issue_title
+        self.issue_url = issue_url
+        self.labels = labels
+        self.label_keys = frozenset(key for key in (str(label).strip().lower() for label in labels) if key)
+        self.assignee_keys = frozenset(key for key in (str(assignee).strip().lower() for assignee in assignees) if key)
+
+
+def issue_from_json_record(issue_record, now_ts, repo_web_url):
+    issue_number = int(issue_record['number'])
+    updated_at = issue_record['updatedAt']
+    updated_dt = parse_github_timestamp(updated_at)
+    unix_timestamp_updated = int(updated_dt.replace(tzinfo=datetime.timezone.utc).timestamp())
+    assignees = extract_assignee_logins(issue_record.get('assignees', []))
+    labels = extract_label_names(issue_record.get('labels', []))
+    if not labels:
+        labels = ['']
+    issue_title = issue_record.get('title', '')
+    issue_url = issue_record.get('url', '')
+    if not issue_url:
+        issue_url = '{}/issues/{}'.format(repo_web_url, issue_number)
+    return IssueRecord(
+        issue_number,
+        assignees,
+        format_relative_elapsed(max(0.0, now_ts - unix_timestamp_updated)),
+        unix_timestamp_updated,
+        issue_title,
+        issue_url,
+        labels,
+    )
+
+
 def parse_github_timestamp(value):
     if not isinstance(value, str):
         raise ValueError('timestamp must be a string')
@@ -369,7 +505,1223 @@ def wiki_git_url_from_input(repo_url, repo_slug):
     return 'https://github.com/{}.wiki.git'.format(repo_slug)
 
 
+def read_int_env(name, default, minimum=0):
+    raw_value = os.environ.get(name, '')
+    if raw_value == '':
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        print('Warning: Invalid {} value: {}. Using default {}.'.format(name, raw_value, default))
+        return default
+    if value < minimum:
+        if minimum == 0:
+            print('Warning: Negative {} value: {}. Using 0.'.format(name, value))
+        else:
+            print('Warning: {} value {} is below {}. Using {}.'.format(name, value, minimum, minimum))
+        return minimum
+    return value
+
+
+def read_choice_env(name, default, choices):
+    raw_value = os.environ.get(name, '').strip().lower()
+    if raw_value == '':
+        return default
+    if raw_value not in choices:
+        print('Warning: Invalid {} value: {}. Using default {}.'.format(name, raw_value, default))
+        return default
+    return raw_value
+
+
+# Instrumentation: every gh/git call goes through run_command so calls are counted and timed per category,
+# and the script is split into phases with start_phase. Both end up in report_metrics.json.
+COMMAND_LATENCY_BUCKETS_SEC = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+command_metrics = {}
+command_metrics_lock = threading.Lock()
+phase_starts = []
+
+
+def run_command(category, command, is_failure=None):
+    started = time.monotonic()
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    elapsed = time.monotonic() - started
+    record_command(category, elapsed, is_failure(result) if is_failure else result.returncode != 0)
+    return result
+
+
+def record_command(category, elapsed, failed):
+    with command_metrics_lock:
+        stats = command_metrics.setdefault(category, {'count': 0, 'failures': 0, 'latencies_sec': []})
+        stats['count'] += 1
+        stats['failures'] += int(failed)
+        stats['latencies_sec'].append(elapsed)
+
+
+def run_streaming_command(category, command, consume):
+    # Hands raw stdout chunks to `consume` while the command runs and returns (return code, stderr text, result).
+    # If `consume` stops before the end of the output, the command is terminated and counted as successful.
+    started = time.monotonic()
+    reached_eof = False
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+
+        def stdout_chunks():
+            nonlocal reached_eof
+            for chunk in iter(lambda: proc.stdout.read1(JSON_STREAM_CHUNK_SIZE), b''):
+                yield chunk
+            reached_eof = True
+
+        try:
+            consumed = consume(stdout_chunks())
+        finally:
+            if not reached_eof:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        returncode = proc.returncode if reached_eof else 0
+        stderr_file.seek(0)
+        stderr_text = stderr_file.read().decode('utf8', 'replace').strip()
+    record_command(category, time.monotonic() - started, returncode != 0)
+    return returncode, stderr_text, consumed
+
+
+def start_phase(name):
+    phase_starts.append((name, time.monotonic()))
+
+
+def latency_percentile(sorted_latencies, fraction):
+    return sorted_latencies[min(len(sorted_latencies) - 1, int(round(fraction * (len(sorted_latencies) - 1))))]
+
+
+def summarize_metrics(end_time):
+    phases = {}
+    for index, (name, started) in enumerate(phase_starts):
+        ended = phase_starts[index + 1][1] if index + 1 < len(phase_starts) else end_time
+        phases[name] = round(phases.get(name, 0.0) + ended - started, 3)
+    commands = {}
+    for category, stats in sorted(command_metrics.items()):
+        latencies = sorted(stats['latencies_sec'])
+        bucket_counts = [0] * (len(COMMAND_LATENCY_BUCKETS_SEC) + 1)
+        for latency in latencies:
+            bucket_counts[bisect.bisect_left(COMMAND_LATENCY_BUCKETS_SEC, latency)] += 1
+        bucket_labels = ['<={}'.format(bound) for bound in COMMAND_LATENCY_BUCKETS_SEC] + ['>{}'.format(COMMAND_LATENCY_BUCKETS_SEC[-1])]
+        commands[category] = {
+            'count': stats['count'],
+            'failures': stats['failures'],
+            'failure_rate': round(stats['failures'] / stats['count'], 4),
+            'total_sec': round(sum(latencies), 3),
+            'p50_sec': round(latency_percentile(latencies, 0.5), 3),
+            'p95_sec': round(latency_percentile(latencies, 0.95), 3),
+            'max_sec': round(latencies[-1], 3),
+            'histogram_sec': dict(zip(bucket_labels, bucket_counts)),
+        }
+    total = round(end_time - phase_starts[0][1], 3) if phase_starts else 0.0
+    return {'total_sec': total, 'phases_sec': phases, 'commands': commands}
+
+
+def metrics_markdown(metrics):
+    lines = ['### write_issue_report.py metrics', '', 'Total: {:.1f} s'.format(metrics['total_sec']), '']
+    lines += ['| Phase | Seconds |', '| --- | ---: |']
+    lines += ['| {} | {:.2f} |'.format(name, seconds) for name, seconds in metrics['phases_sec'].items()]
+    lines += ['', '| Command | Calls | Failures | p50 (s) | p95 (s) | Total (s) |', '| --- | ---: | ---: | ---: | ---: | ---: |']
+    for category, stats in metrics['commands'].items():
+        lines.append('| {} | {:,} | {:,} | {:.2f} | {:.2f} | {:.1f} |'.format(
+            category, stats['count'], stats['failures'], stats['p50_sec'], stats['p95_sec'], stats['total_sec']))
+    return '\n'.join(lines) + '\n\n'
+
+
+# GitHub rate-limit state shared by all gh calls, kept per rate-limit resource (core, graphql, search) since each
+# has its own budget. It is refreshed from the headers of `gh api -i` responses; rate-limited calls are retried
+# after Retry-After, the limit reset, or a jittered exponential backoff.
+RATE_LIMIT_STATUS_CODES = (403, 429)
+rate_limit_state = {}
+rate_limit_lock = threading.Lock()
+gh_max_retries = 4
+gh_retry_base_delay_sec = 1.0
+gh_retry_max_delay_sec = 60
+gh_rate_limit_reserve = 100
+
+
+def parse_response_headers(stdout_bytes):
+    # Status code and lowercased headers of the first block printed by `gh api -i`, or (None, {}).
+    if not stdout_bytes.startswith(b'HTTP/'):
+        return None, {}
+    head = stdout_bytes.split(b'\r\n\r\n', 1)[0].split(b'\n\n', 1)[0].decode('utf8', 'replace')
+    lines = head.splitlines()
+    status_fields = lines[0].split()
+    status_code = int(status_fields[1]) if len(status_fields) >= 2 and status_fields[1].isdigit() else None
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip().lower()] = value.strip()
+    return status_code, headers
+
+
+def header_int(headers, name):
+    value = headers.get(name, '')
+    return int(value) if value.isdigit() else None
+
+
+def is_rate_limited(result, status_code, headers):
+    if status_code in RATE_LIMIT_STATUS_CODES and ('retry-after' in headers or headers.get('x-ratelimit-remaining') == '0'):
+        return True
+    stderr_text = result.stderr.decode('utf8', 'replace').lower()
+    return result.returncode != 0 and ('rate limit' in stderr_text or 'http 429' in stderr_text)
+
+
+def rate_limit_resource(command):
+    # The budget a gh command draws from: gh issue subcommands and `gh api graphql` use GraphQL.
+    if command[:2] != ['gh', 'api'] or len(command) < 3 or command[2] == 'graphql':
+        return 'graphql'
+    return 'search' if command[2].startswith('search/') else 'core'
+
+
+def rate_limit_bucket(resource):
+    # Callers hold rate_limit_lock.
+    return rate_limit_state.setdefault(resource, {'remaining': None, 'reset': None, 'pause_until': 0.0})
+
+
+def rate_limit_budget_scarce(resource):
+    # True while the remaining budget is inside the reserve and the reset is too far away to wait for.
+    with rate_limit_lock:
+        bucket = rate_limit_bucket(resource)
+        remaining = bucket['remaining']
+        reset = bucket['reset']
+    if remaining is None or remaining > gh_rate_limit_reserve:
+        return False
+    return reset is None or reset - time.time() > gh_retry_max_delay_sec
+
+
+def wait_for_rate_limit(resource):
+    with rate_limit_lock:
+        bucket = rate_limit_bucket(resource)
+        delay = bucket['pause_until'] - time.monotonic()
+        if bucket['remaining'] == 0 and bucket['reset'] is not None:
+            reset_delay = bucket['reset'] - time.time()
+            if reset_delay <= gh_retry_max_delay_sec:
+                delay = max(delay, reset_delay)
+    if delay > 0:
+        time.sleep(delay)
+
+
+def record_rate_limit_headers(headers, resource):
+    # GitHub names the budget in x-ratelimit-resource; the command's own resource is the fallback.
+    with rate_limit_lock:
+        bucket = rate_limit_bucket(headers.get('x-ratelimit-resource') or resource)
+        if header_int(headers, 'x-ratelimit-remaining') is not None:
+            bucket['remaining'] = header_int(headers, 'x-ratelimit-remaining')
+        if header_int(headers, 'x-ratelimit-reset') is not None:
+            bucket['reset'] = header_int(headers, 'x-ratelimit-reset')
+
+
+# Optional in-process transport for `gh api` calls (GITHUB_API_TRANSPORT=http). Requests go over persistent
+# http.client connections, one set per worker thread, authenticated with GITHUB_TOKEN. Results carry what gh would
+# have printed, so parsing, retries and metrics are shared with the gh path; other gh commands still run gh.
+github_api_transport = 'gh'
+github_api_url = 'https://api.github.com'
+github_graphql_url = 'https://api.github.com/graphql'
+github_api_token = ''
+github_http_local = threading.local()
+GITHUB_HTTP_TIMEOUT_SEC = 60
+GITHUB_HTTP_USER_AGENT = 'kflab-bot-write-issue-report'
+
+
+def parse_gh_api_command(command):
+    # (method, url, headers, JSON body, include headers, paginate, jq filter) for the `gh api` forms used here,
+    # or None when the command has to run through gh.
+    if command[:2] != ['gh', 'api'] or len(command) < 3:
+        return None
+    endpoint = command[2]
+    headers = {}
+    fields = {}
+    include_headers = False
+    paginate = False
+    jq_filter = None
+    index = 3
+    while index < len(command):
+        arg = command[index]
+        if arg == '-i':
+            include_headers = True
+        elif arg == '--paginate':
+            paginate = True
+        elif arg in ('-H', '-f', '-F', '--jq') and index + 1 < len(command):
+            index += 1
+            value = command[index]
+            if arg == '-H':
+                key, _, header_value = value.partition(':')
+                headers[key.strip()] = header_value.strip()
+            elif arg == '--jq':
+                jq_filter = value
+            else:
+                key, _, field_value = value.partition('=')
+                fields[key] = int(field_value) if arg == '-F' and re.match(r'^-?\d+$', field_value) else field_value
+        else:
+            return None
+        index += 1
+    # Only the filters used by this script are evaluated in-process.
+    if jq_filter is not None and jq_filter != '.[]' and not re.match(r'^\.\w+$', jq_filter):
+        return None
+    if endpoint == 'graphql':
+        if 'query' not in fields or paginate:
+            return None
+        query = fields.pop('query')
+        return 'POST', github_graphql_url, headers, {'query': query, 'variables': fields}, include_headers, False, jq_filter
+    if fields:
+        return None
+    return 'GET', github_api_url + '/' + endpoint.lstrip('/'), headers, None, include_headers, paginate, jq_filter
+
+
+def github_http_request(method, url, headers, body):
+    parsed = urllib.parse.urlsplit(url)
+    connections = getattr(github_http_local, 'connections', None)
+    if connections is None:
+        connections = github_http_local.connections = {}
+    request_headers = {
+        'Authorization': 'Bearer {}'.format(github_api_token),
+        'Accept': 'application/vnd.github+json',
+        'User-Agent': GITHUB_HTTP_USER_AGENT,
+    }
+    request_headers.update(headers)
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode('utf-8')
+        request_headers['Content-Type'] = 'application/json'
+    path = (parsed.path or '/') + ('?' + parsed.query if parsed.query else '')
+    key = (parsed.scheme, parsed.netloc)
+    for attempt in range(2):
+        connection = connections.get(key)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+            connection = connections[key] = connection_class(parsed.netloc, timeout=GITHUB_HTTP_TIMEOUT_SEC)
+        try:
+            connection.request(method, path, body=data, headers=request_headers)
+            response = connection.getresponse()
+            return response.status, response.reason, response.getheaders(), response.read()
+        except (http.client.HTTPException, ConnectionError):
+            # A kept-alive connection the server has already closed fails on first use; reconnect once.
+            connection.close()
+            del connections[key]
+            if attempt == 1:
+                raise
+
+
+def jq_output(value, jq_filter):
+    if jq_filter == '.[]':
+        values = value if isinstance(value, list) else []
+    elif jq_filter:
+        values = [value.get(jq_filter[1:]) if isinstance(value, dict) else None]
+    else:
+        values = [value]
+    # Like gh --jq, strings are printed raw and everything else as compact JSON.
+    return ''.join([(item if isinstance(item, str) else json.dumps(item, separators=(',', ':'))) + '\n' for item in values]).encode('utf-8')
+
+
+def next_page_url(link_header):
+    for part in link_header.split(','):
+        match = re.match(r'\s*<([^>]+)>\s*;\s*rel="next"', part)
+        if match:
+            return match.group(1)
+    return None
+
+
+def run_github_http(category, command, request, is_failure=None):
+    method, url, headers, body, include_headers, paginate, jq_filter = request
+    started = time.monotonic()
+    stdout_parts = []
+    stderr_text = ''
+    returncode = 0
+    try:
+        while url:
+            status, reason, response_headers, payload = github_http_request(method, url, headers, body)
+            header_map = {name.lower(): value for name, value in response_headers}
+            record_rate_limit_headers(header_map, rate_limit_resource(command))
+            if include_headers:
+                stdout_parts.append('HTTP/1.1 {} {}\r\n{}\r\n'.format(
+                    status, reason, ''.join(['{}: {}\r\n'.format(name, value) for name, value in response_headers])).encode('utf-8'))
+            if status >= 300:
+                try:
+                    message = json.loads(payload.decode('utf-8')).get('message')
+                except (ValueError, AttributeError):
+                    message = None
+                stderr_text = 'gh: {} (HTTP {})'.format(message or reason, status)
+                returncode = 1
+                break
+            response = json.loads(payload.decode('utf-8')) if payload.strip() else None
+            if method == 'POST' and isinstance(response, dict) and response.get('errors'):
+                # gh prints GraphQL responses with errors but exits non-zero.
+                stderr_text = 'gh: GraphQL: {}'.format('; '.join([str(error.get('message')) for error in response['errors'] if isinstance(error, dict)]))
+                returncode = 1
+            stdout_parts.append(jq_output(response, jq_filter))
+            url = next_page_url(header_map.get('link', '')) if paginate else None
+    except (OSError, http.client.HTTPException, ValueError) as exc:
+        stderr_text = 'gh: {}'.format(exc)
+        returncode = 1
+    result = subprocess.CompletedProcess(command, returncode, b''.join(stdout_parts), stderr_text.encode('utf-8'))
+    record_command(category, time.monotonic() - started, is_failure(result) if is_failure else returncode != 0)
+    return result
+
+
+def run_gh_command(category, command, is_failure=None):
+    http_request = parse_gh_api_command(command) if github_api_transport == 'http' else None
+    resource = rate_limit_resource(command)
+    for attempt in range(gh_max_retries + 1):
+        wait_for_rate_limit(resource)
+        if http_request:
+            result = run_github_http(category, command, http_request, is_failure)
+        else:
+            result = run_command(category, command, is_failure)
+        status_code, headers = parse_response_headers(result.stdout)
+        record_rate_limit_headers(headers, resource)
+        if attempt == gh_max_retries or not is_rate_limited(result, status_code, headers):
+            return result
+        retry_after = header_int(headers, 'retry-after')
+        reset = header_int(headers, 'x-ratelimit-reset')
+        if retry_after is not None:
+            delay = retry_after
+        elif headers.get('x-ratelimit-remaining') == '0' and reset is not None:
+            delay = reset - time.time()
+        else:
+            delay = gh_retry_base_delay_sec * (2 ** attempt) * random.uniform(0.5, 1.5)
+        delay = min(max(delay, 0.0), gh_retry_max_delay_sec)
+        print('Warning: GitHub rate limit hit ({}). Retrying in {:.1f} seconds.'.format(category, delay))
+        # Pause every worker using the same budget, not just this one, so the pool backs off together.
+        with rate_limit_lock:
+            bucket = rate_limit_bucket(headers.get('x-ratelimit-resource') or resource)
+            bucket['pause_until'] = max(bucket['pause_until'], time.monotonic() + delay)
+    return result
+
+
+GRAPHQL_COMMENT_PAGE_SIZE = 100
+# Reactions are fetched inline with their issue or comment; nodes with more reactions than this fall back to a
+# REST lookup. The comment limit is lower to keep a 50-issue batch under GitHub's 500,000-node query limit.
+GRAPHQL_ISSUE_REACTION_PAGE_SIZE = 100
+GRAPHQL_COMMENT_REACTION_PAGE_SIZE = 20
+
+GRAPHQL_COMMENT_FRAGMENT = '''
+fragment CommentFields on IssueComment {
+  databaseId
+  url
+  createdAt
+  author { login }
+  reactionGroups { content users { totalCount } }
+  reactions(first: %d) {
+    pageInfo { hasNextPage }
+    nodes { createdAt user { login } }
+  }
+}
+''' % GRAPHQL_COMMENT_REACTION_PAGE_SIZE
+
+GRAPHQL_ISSUE_FRAGMENT = '''
+fragment IssueFields on Issue {
+  number
+  createdAt
+  updatedAt
+  url
+  title
+  author { login }
+  labels(first: 100) { nodes { name } }
+  reactionGroups { content users { totalCount } }
+  reactions(first: %d) {
+    pageInfo { hasNextPage }
+    nodes { createdAt user { login } }
+  }
+  comments(first: %d) {
+    pageInfo { hasNextPage endCursor }
+    nodes { ...CommentFields }
+  }
+}
+''' % (GRAPHQL_ISSUE_REACTION_PAGE_SIZE, GRAPHQL_COMMENT_PAGE_SIZE)
+
+
+def graphql_issue_batch_query(issue_nums):
+    aliases = ['    i{0}: issue(number: {0}) {{ ...IssueFields }}'.format(issue_num) for issue_num in issue_nums]
+    return (
+        'query IssueBatch($owner: String!, $name: String!) {\n'
+        '  repository(owner: $owner, name: $name) {\n'
+        + '\n'.join(aliases) + '\n'
+        '  }\n'
+        '}\n'
+        + GRAPHQL_ISSUE_FRAGMENT
+        + GRAPHQL_COMMENT_FRAGMENT
+    )
+
+
+# Reactions only, for issues whose other fields come from the issue view cache. Comments past the first page are
+# left to REST lookups.
+GRAPHQL_ISSUE_REACTION_FRAGMENT = '''
+fragment IssueReactionFields on Issue {
+  reactions(first: %d) {
+    pageInfo { hasNextPage }
+    nodes { createdAt user { login } }
+  }
+  comments(first: %d) {
+    nodes {
+      databaseId
+      reactions(first: %d) {
+        pageInfo { hasNextPage }
+        nodes { createdAt user { login } }
+      }
+    }
+  }
+}
+''' % (GRAPHQL_ISSUE_REACTION_PAGE_SIZE, GRAPHQL_COMMENT_PAGE_SIZE, GRAPHQL_COMMENT_REACTION_PAGE_SIZE)
+
+
+def graphql_reaction_batch_query(issue_nums):
+    aliases = ['    i{0}: issue(number: {0}) {{ ...IssueReactionFields }}'.format(issue_num) for issue_num in issue_nums]
+    return (
+        'query ReactionBatch($owner: String!, $name: String!) {\n'
+        '  repository(owner: $owner, name: $name) {\n'
+        + '\n'.join(aliases) + '\n'
+        '  }\n'
+        '}\n'
+        + GRAPHQL_ISSUE_REACTION_FRAGMENT
+    )
+
+
+def graphql_issue_comments_query():
+    return (
+        'query IssueComments($owner: String!, $name: String!, $number: Int!, $cursor: String!) {\n'
+        '  repository(owner: $owner, name: $name) {\n'
+        '    issue(number: $number) {\n'
+        '      comments(first: %d, after: $cursor) {\n'
+        '        pageInfo { hasNextPage endCursor }\n'
+        '        nodes { ...CommentFields }\n'
+        '      }\n'
+        '    }\n'
+        '  }\n'
+        '}\n' % GRAPHQL_COMMENT_PAGE_SIZE
+        + GRAPHQL_COMMENT_FRAGMENT
+    )
+
+
+def run_gh_graphql(query, variables, category):
+    gh_command = ['gh', 'api', 'graphql', '-f', 'query={}'.format(query)]
+    for key, value in variables.items():
+        if isinstance(value, int):
+            gh_command += ['-F', '{}={}'.format(key, value)]
+        else:
+            gh_command += ['-f', '{}={}'.format(key, value)]
+    gh_out = run_gh_command(category, gh_command)
+    stdout_text = gh_out.stdout.decode('utf8')
+    try:
+        response = json.loads(stdout_text) if stdout_text.strip() else None
+    except json.JSONDecodeError:
+        response = None
+    # gh exits non-zero when the response carries GraphQL errors, but partial data is still usable.
+    if isinstance(response, dict) and isinstance(response.get('data'), dict):
+        return response['data'], None
+    error_text = gh_out.stderr.decode('utf8').strip()
+    if not error_text:
+        error_text = 'unexpected GraphQL response: {}'.format(stdout_text.strip()[:200])
+    return None, error_text
+
+
+def graphql_reactions_to_list(connection):
+    # REST-shaped reactions from an inline GraphQL connection, or None when it is missing or has more pages.
+    if not isinstance(connection, dict) or not isinstance(connection.get('nodes'), list):
+        return None
+    page_info = connection.get('pageInfo')
+    if not isinstance(page_info, dict) or page_info.get('hasNextPage') is not False:
+        return None
+    return [
+        {'created_at': node.get('createdAt'), 'user': {'login': extract_login(node.get('user'))}}
+        for node in connection['nodes'] if isinstance(node, dict)
+    ]
+
+
+def graphql_comment_to_view(node):
+    return {
+        'databaseId': node.get('databaseId'),
+        'url': node.get('url'),
+        'createdAt': node.get('createdAt'),
+        'author': node.get('author'),
+        'reactionGroups': node.get('reactionGroups'),
+        'inlineReactions': graphql_reactions_to_list(node.get('reactions')),
+    }
+
+
+def graphql_issue_to_view(node):
+    labels = node.get('labels')
+    if isinstance(labels, dict):
+        labels = labels.get('nodes') or []
+    comments = node.get('comments')
+    comment_nodes = comments.get('nodes') if isinstance(comments, dict) else None
+    return {
+        'number': node.get('number'),
+        'createdAt': node.get('createdAt'),
+        'updatedAt': node.get('updatedAt'),
+        'url': node.get('url'),
+        'title': node.get('title'),
+        'author': node.get('author'),
+        'labels': labels,
+        'reactionGroups': node.get('reactionGroups'),
+        'inlineReactions': graphql_reactions_to_list(node.get('reactions')),
+        'comments': [graphql_comment_to_view(c) for c in (comment_nodes or []) if isinstance(c, dict)],
+    }
+
+
+def fetch_remaining_graphql_comments(owner, name, issue_num, cursor):
+    comments = []
+    query = graphql_issue_comments_query()
+    while cursor:
+        data, error_text = run_gh_graphql(query, {'owner': owner, 'name': name, 'number': issue_num, 'cursor': cursor}, 'issue_comments_graphql')
+        try:
+            connection = data['repository']['issue']['comments']
+            page_info = connection['pageInfo']
+        except (KeyError, TypeError):
+            return None, error_text or 'missing comment connection'
+        comments.extend(graphql_comment_to_view(c) for c in (connection.get('nodes') or []) if isinstance(c, dict))
+        cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+    return comments, None
+
+
+def read_json_file(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path, data):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = '{}.tmp{}'.format(path, os.getpid())
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        print('Warning: Could not write cache file {}: {}'.format(path, exc))
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def file_sha256(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def commit_output_files(outputs, stale_pattern):
+    # Writes `outputs` (path -> text, in commit order) through a staging directory next to them and moves each
+    # file into place with os.replace, so a failed run leaves the previous outputs intact. Files whose content
+    # did not change are left untouched, and files matching `stale_pattern` that are not outputs are removed.
+    staging_dir = tempfile.mkdtemp(prefix='.report_output.', dir='.')
+    try:
+        staged = []
+        for path, text in outputs.items():
+            data = text.encode('utf-8')
+            if file_sha256(path) == hashlib.sha256(data).hexdigest():
+                continue
+            staged_path = os.path.join(staging_dir, str(len(staged)))
+            with open(staged_path, 'wb') as f:
+                f.write(data)
+            staged.append((staged_path, path))
+        for staged_path, path in staged:
+            os.replace(staged_path, path)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    for stale_path in glob.glob(stale_pattern):
+        if stale_path in outputs:
+            continue
+        try:
+            os.remove(stale_path)
+        except OSError as exc:
+            print('Failed to remove {}: {}'.format(stale_path, exc))
+    return len(staged)
+
+
+def load_cached_issue_view(cache_dir, issue_num, updated_at):
+    if not updated_at:
+        return None
+    path = os.path.join(cache_dir, '{}.json'.format(issue_num))
+    entry = read_json_file(path)
+    if not isinstance(entry, dict) or entry.get('updatedAt') != updated_at:
+        return None
+    try:
+        # Refresh mtime so eviction drops the least recently used entries first.
+        os.utime(path)
+    except OSError:
+        pass
+    return entry.get('payload')
+
+
+def store_cached_issue_view(cache_dir, issue_num, updated_at, payload):
+    if not updated_at:
+        return
+    write_json_atomic(os.path.join(cache_dir, '{}.json'.format(issue_num)), {'updatedAt': updated_at, 'payload': payload})
+
+
+def evict_cache_dir(cache_dir, max_age_sec, max_bytes):
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    now = time.time()
+    for entry in os.scandir(cache_dir):
+        if not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if now - stat.st_mtime > max_age_sec:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total_bytes -= size
+        except OSError:
+            pass
+
+
+def run_concurrently(func, items, max_workers):
+    # Results come back in input order regardless of completion order.
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+# The search API behind `gh issue list --search` returns at most this many results per query, without an error.
+ISSUE_SEARCH_RESULT_CAP = 1000
+# Upper bound on search queries per run, in case ranges keep hitting the cap however finely they are split.
+ISSUE_SEARCH_MAX_QUERIES = 200
+
+
+def format_updated_search(start, end):
+    # Whole days keep the plain date form; bisected ranges need second precision.
+    if start.time() == datetime.time(0) and end.time() == datetime.time(23, 59, 59):
+        return 'updated:{}..{}'.format(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+    return 'updated:{}..{}'.format(start.strftime('%Y-%m-%dT%H:%M:%SZ'), end.strftime('%Y-%m-%dT%H:%M:%SZ'))
+
+
+def split_search_range(start, end):
+    # Multi-day ranges are split into days, single days into halves; [] once a range cannot be split.
+    if start.date() < end.date():
+        ranges = []
+        day = start.date()
+        while day <= end.date():
+            day_start = datetime.datetime.combine(day, datetime.time(0))
+            ranges.append((max(start, day_start), min(end, day_start + datetime.timedelta(days=1, seconds=-1))))
+            day += datetime.timedelta(days=1)
+        return ranges
+    if end - start < datetime.timedelta(seconds=2):
+        return []
+    middle = (start + (end - start) / 2).replace(microsecond=0)
+    return [(start, middle), (middle + datetime.timedelta(seconds=1), end)]
+
+
+# Returns (output lines or None when gh failed, messages); messages are printed by the caller, not the worker.
+def search_recent_issues(search_range, listing_fields):
+    gh_command = [
+        'gh', 'issue', 'list',
+        '--limit', str(ISSUE_SEARCH_RESULT_CAP),
+        '--state', 'all',
+        '--search', format_updated_search(*search_range),
+    ] + listing_fields
+    messages = ['gh command: {}'.format(' '.join(gh_command))]
+    gh_out = run_gh_command('issue_list', gh_command)
+    if gh_out.returncode != 0:
+        messages.append('Warning: gh command failed: {}'.format(gh_out.stderr.decode('utf8').strip()))
+        return None, messages
+    return [line for line in gh_out.stdout.decode('utf8').split('\n') if line.strip()], messages
+
+
+# Lists issues updated between start and end (inclusive) as output lines of `gh issue list`. The whole window is
+# searched first; ranges that reach the search cap are split and searched again concurrently, level by level.
+def enumerate_recent_issue_lines(start, end, listing_fields, max_workers):
+    lines = []
+    pending_ranges = [(start, end)]
+    num_queries = 0
+    while pending_ranges:
+        num_queries += len(pending_ranges)
+        results = run_concurrently(lambda search_range: search_recent_issues(search_range, listing_fields), pending_ranges, max_workers)
+        next_ranges = []
+        for search_range, (range_lines, messages) in zip(pending_ranges, results):
+            for message in messages:
+                print(message)
+            if range_lines is None:
+                continue
+            if len(range_lines) >= ISSUE_SEARCH_RESULT_CAP:
+                sub_ranges = split_search_range(*search_range)
+                if sub_ranges and num_queries + len(next_ranges) + len(sub_ranges) <= ISSUE_SEARCH_MAX_QUERIES:
+                    next_ranges += sub_ranges
+                    continue
+                print('Warning: {} reached the search limit of {:,} results. Some issues may be missing.'.format(
+                    format_updated_search(*search_range), ISSUE_SEARCH_RESULT_CAP))
+            lines += range_lines
+        pending_ranges = next_ranges
+    return lines
+
+
+# Returns ({issue number: payload shaped like `gh issue view --json`} or None when the whole batch failed, messages).
+# Issues missing from the dict (e.g. NOT_FOUND aliases) are left for the caller to fetch individually.
+def fetch_issue_batch_graphql(repo_slug, issue_nums):
+    owner, name = repo_slug.split('/', 1)
+    messages = []
+    data, error_text = run_gh_graphql(graphql_issue_batch_query(issue_nums), {'owner': owner, 'name': name}, 'issue_batch_graphql')
+    repository = data.get('repository') if data else None
+    if not isinstance(repository, dict):
+        messages.append('Warning: GraphQL issue batch failed: {}'.format(error_text or 'missing repository'))
+        return None, messages
+    payloads = {}
+    for issue_num in issue_nums:
+        node = repository.get('i{}'.format(issue_num))
+        if not isinstance(node, dict):
+            continue
+        payload = graphql_issue_to_view(node)
+        comments = node.get('comments')
+        page_info = comments.get('pageInfo') if isinstance(comments, dict) else None
+        if isinstance(page_info, dict) and page_info.get('hasNextPage'):
+            more_comments, comment_error = fetch_remaining_graphql_comments(owner, name, issue_num, page_info.get('endCursor'))
+            if more_comments is None:
+                messages.append('Warning: Could not page comments for issue {} via GraphQL: {}'.format(issue_num, comment_error))
+                continue
+            payload['comments'].extend(more_comments)
+        payloads[issue_num] = payload
+    return payloads, messages
+
+
+# Returns ({issue number: {(kind, target id): REST-shaped reactions}} or None when the batch failed, messages).
+# Targets that are missing or have more reactions than one inline page are left out, to be looked up over REST.
+def fetch_reaction_batch_graphql(repo_slug, issue_nums):
+    owner, name = repo_slug.split('/', 1)
+    data, error_text = run_gh_graphql(graphql_reaction_batch_query(issue_nums), {'owner': owner, 'name': name}, 'reaction_batch_graphql')
+    repository = data.get('repository') if data else None
+    if not isinstance(repository, dict):
+        return None, ['Warning: GraphQL reaction batch failed: {}'.format(error_text or 'missing repository')]
+    batch_reactions = {}
+    for issue_num in issue_nums:
+        node = repository.get('i{}'.format(issue_num))
+        if not isinstance(node, dict):
+            continue
+        known = batch_reactions[issue_num] = {}
+        issue_reactions = graphql_reactions_to_list(node.get('reactions'))
+        if issue_reactions is not None:
+            known[('issue', issue_num)] = issue_reactions
+        comments = node.get('comments')
+        for comment in (comments.get('nodes') or []) if isinstance(comments, dict) else []:
+            if not isinstance(comment, dict) or not isinstance(comment.get('databaseId'), int):
+                continue
+            comment_reactions = graphql_reactions_to_list(comment.get('reactions'))
+            if comment_reactions is not None:
+                known[('comment', comment['databaseId'])] = comment_reactions
+    return batch_reactions, []
+
+
+def seed_reaction_cache(cache_dir, kind, target_id, reactions):
+    # Inline reactions are stored like a REST lookup without an ETag, so a later lookup past the cap has a list to fall back to.
+    if not cache_dir:
+        return
+    cache_path = os.path.join(cache_dir, '{}_{}.json'.format(kind, target_id))
+    cache_entry = read_json_file(cache_path)
+    if isinstance(cache_entry, dict) and cache_entry.get('reactions') == reactions:
+        return
+    write_json_atomic(cache_path, {'etag': None, 'reactions': reactions})
+
+
+ISSUE_STATS_QUERY = (
+    'query IssueStats($owner: String!, $name: String!) {\n'
+    '  repository(owner: $owner, name: $name) {\n'
+    '    open: issues(states: OPEN) { totalCount }\n'
+    '    closed: issues(states: CLOSED) { totalCount }\n'
+    '  }\n'
+    '}\n'
+)
+
+
+def fetch_issue_stats(repo_slug):
+    # Open and closed issue counts from one GraphQL request, with the search API's total_count as a fallback.
+    owner, name = repo_slug.split('/', 1)
+    data, error_text = run_gh_graphql(ISSUE_STATS_QUERY, {'owner': owner, 'name': name}, 'issue_stats_graphql')
+    repository = data.get('repository') if data else None
+    if isinstance(repository, dict):
+        counts = {state: (repository.get(state) or {}).get('totalCount') for state in ('open', 'closed')}
+        if all(isinstance(count, int) for count in counts.values()):
+            return counts, None
+    counts = {}
+    for state in ('open', 'closed'):
+        query = urllib.parse.quote('repo:{} is:issue is:{}'.format(repo_slug, state), safe='')
+        gh_out = run_gh_command('issue_stats_search', ['gh', 'api', 'search/issues?q={}&per_page=1'.format(query), '--jq', '.total_count'])
+        try:
+            counts[state] = int(gh_out.stdout.decode('utf8').strip())
+        except ValueError:
+            return None, gh_out.stderr.decode('utf8').strip() or error_text or 'unexpected search response'
+    return counts, None
+
+
+# Participant searches run as aliased `search` connections, this many logins per GraphQL request.
+PARTICIPANT_SEARCH_BATCH_SIZE = 20
+PARTICIPANT_SEARCH_PAGE_SIZE = 100
+
+
+def graphql_participant_search_query(pages):
+    # pages: [(alias index, cursor or None)]; each alias reads its search string from $q<index>.
+    variables = ['$q{}: String!'.format(index) for index, _ in pages]
+    variables += ['$c{}: String!'.format(index) for index, cursor in pages if cursor]
+    aliases = []
+    for index, cursor in pages:
+        after = ', after: $c{}'.format(index) if cursor else ''
+        aliases.append(
+            '  p{0}: search(query: $q{0}, type: ISSUE, first: {1}{2}) {{\n'
+            '    issueCount\n'
+            '    pageInfo {{ hasNextPage endCursor }}\n'
+            '    nodes {{ ... on Issue {{ number }} }}\n'
+            '  }}'.format(index, PARTICIPANT_SEARCH_PAGE_SIZE, after)
+        )
+    return 'query ParticipantIssues({}) {{\n{}\n}}\n'.format(', '.join(variables), '\n'.join(aliases))
+
+
+# Issue numbers updated in the window that involve (author, assignee, commenter or mention) any of the logins.
+# Returns (set, None), or (None, reason) when a search fails or exceeds the search result cap.
+def find_participant_issue_nums(repo_slug, logins, window):
+    searches = ['repo:{} is:issue involves:{} {}'.format(repo_slug, login, format_updated_search(*window)) for login in logins]
+    issue_nums = set()
+    pending = [(index, None) for index in range(len(searches))]
+    while pending:
+        next_pending = []
+        for batch_start in range(0, len(pending), PARTICIPANT_SEARCH_BATCH_SIZE):
+            pages = pending[batch_start:batch_start + PARTICIPANT_SEARCH_BATCH_SIZE]
+            variables = {}
+            for index, cursor in pages:
+                variables['q{}'.format(index)] = searches[index]
+                if cursor:
+                    variables['c{}'.format(index)] = cursor
+            data, error_text = run_gh_graphql(graphql_participant_search_query(pages), variables, 'participant_search')
+            if data is None:
+                return None, error_text
+            for index, _ in pages:
+                connection = data.get('p{}'.format(index))
+                if not isinstance(connection, dict) or not isinstance(connection.get('nodes'), list):
+                    return None, 'missing search result for {}'.format(searches[index])
+                if (connection.get('issueCount') or 0) > ISSUE_SEARCH_RESULT_CAP:
+                    return None, '{} matches more than {:,} issues'.format(searches[index], ISSUE_SEARCH_RESULT_CAP)
+                for node in connection['nodes']:
+                    if isinstance(node, dict) and isinstance(node.get('number'), int):
+                        issue_nums.add(node['number'])
+                page_info = connection.get('pageInfo') or {}
+                if page_info.get('hasNextPage') and page_info.get('endCursor'):
+                    next_pending.append((index, page_info['endCursor']))
+        pending = next_pending
+    return issue_nums, None
+
+
+def gh_issue_view(issue_num):
+    gh_command = ['gh', 'issue', 'view', str(issue_num), '--json', 'assignees,author,body,closed,closedAt,comments,createdAt,id,labels,milestone,number,reactionGroups,state,title,updatedAt,url']
+    gh_out = run_gh_command('issue_view', gh_command)
+    if gh_out.returncode != 0:
+        return None, ['gh command failed (issue {}): {}'.format(issue_num, gh_out.stderr.decode('utf8').strip())]
+    try:
+        return json.loads(gh_out.stdout.decode('utf8')), []
+    except json.JSONDecodeError:
+        return None, ['Warning: Could not parse issue JSON for issue {}'.format(issue_num)]
+
+
+# Returns [(issue number, payload)] in input order; payload is None when the issue could not be fetched.
+def fetch_issue_payloads(repo_slug, issue_nums, fetch_mode, batch_size, max_workers):
+    payloads = {}
+    if fetch_mode == 'graphql' and issue_nums:
+        batches = [issue_nums[i:i + batch_size] for i in range(0, len(issue_nums), batch_size)]
+        # Probe with the first batch so an unusable GraphQL endpoint costs a single call.
+        batch_results = [fetch_issue_batch_graphql(repo_slug, batches[0])]
+        if batch_results[0][0] is not None:
+            batch_results += run_concurrently(lambda batch: fetch_issue_batch_graphql(repo_slug, batch), batches[1:], max_workers)
+        for batch_payloads, messages in batch_results:
+            for message in messages:
+                print(message)
+            if batch_payloads is not None:
+                payloads.update(batch_payloads)
+        if batch_results[0][0] is None:
+            print('Warning: Falling back to gh issue view for the remaining issues.')
+    missing_issue_nums = [issue_num for issue_num in issue_nums if issue_num not in payloads]
+    for issue_num, (payload, messages) in zip(missing_issue_nums, run_concurrently(gh_issue_view, missing_issue_nums, max_workers)):
+        for message in messages:
+            print(message)
+        payloads[issue_num] = payload
+    return [(issue_num, payloads[issue_num]) for issue_num in issue_nums]
+
+
+# Runs `gh api -i <endpoint> --paginate --jq '.[]'` and returns (items, unparsable lines, error text, HTTP status, ETag).
+# `-i` exposes the status, ETag and rate-limit headers; an etag makes the request conditional (If-None-Match).
+def gh_api_list(endpoint, category, etag=None):
+    gh_command = ['gh', 'api', endpoint, '-i']
+    if etag:
+        gh_command += ['-H', 'If-None-Match: {}'.format(etag)]
+    gh_command += ['--paginate', '--jq', '.[]']
+    # A 304 answer to a conditional request exits non-zero but is not a failed call.
+    gh_out = run_gh_command(category, gh_command, is_failure=lambda result: result.returncode != 0 and not re.match(rb'HTTP/\S+ 304', result.stdout))
+    status_code = None
+    response_etag = None
+    items = []
+    bad_lines = []
+    in_headers = False
+    # Parse newline-delimited JSON objects from --jq '.[]', skipping the header block printed before each page by -i.
+    for line in gh_out.stdout.decode('utf8').split('\n'):
+        line = line.strip()
+        if line.startswith('HTTP/'):
+            in_headers = True
+            if status_code is None:
+                status_fields = line.split()
+                if len(status_fields) >= 2 and status_fields[1].isdigit():
+                    status_code = int(status_fields[1])
+            continue
+        if in_headers:
+            if line == '':
+                in_headers = False
+            elif response_etag is None and line.lower().startswith('etag:'):
+                response_etag = line.split(':', 1)[1].strip()
+            continue
+        if line:
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                bad_lines.append(line)
+    # gh reports 304 Not Modified as a failure, but the headers still tell us the cached copy is current.
+    if status_code == 304:
+        return None, [], None, status_code, response_etag or etag
+    if gh_out.returncode != 0:
+        return None, [], gh_out.stderr.decode('utf8').strip(), status_code, None
+    return items, bad_lines, None, status_code, response_etag
+
+
+# REST list endpoints return 30 items per page; a conditional request only validates the first page.
+REST_DEFAULT_PAGE_SIZE = 30
+
+
+def fetch_reactions(endpoint, category, cache_path, cache_entry):
+    if not cache_path:
+        items, bad_lines, error_text, _, _ = gh_api_list(endpoint, category)
+        return items, bad_lines, error_text
+    cached_reactions = cache_entry.get('reactions') if isinstance(cache_entry, dict) else None
+    etag = None
+    if isinstance(cached_reactions, list) and len(cached_reactions) < REST_DEFAULT_PAGE_SIZE:
+        etag = cache_entry.get('etag')
+    items, bad_lines, error_text, status_code, response_etag = gh_api_list(endpoint, category, etag=etag)
+    if status_code == 304 and etag:
+        return cached_reactions, [], None
+    if items is None:
+        return None, [], error_text or 'HTTP {}'.format(status_code)
+    compact_reactions = [
+        {'created_at': item.get('created_at'), 'user': {'login': extract_login(item.get('user'))}}
+        for item in items if isinstance(item, dict)
+    ]
+    write_json_atomic(cache_path, {'etag': response_etag, 'reactions': compact_reactions})
+    return items, bad_lines, None
+
+
+# Lookups are (kind, target id, endpoint, issue number, author login, cache path, cache entry) tuples from the scan.
+def fetch_reaction_lookup(lookup):
+    kind, _, endpoint, _, _, cache_path, cache_entry = lookup
+    if kind == 'comment' and rate_limit_budget_scarce('core'):
+        return None, [], 'skipped to keep the last {:,} API requests for higher-priority calls'.format(gh_rate_limit_reserve)
+    return fetch_reactions(endpoint, '{}_reactions'.format(kind), cache_path, cache_entry)
+
+
+# Pages once through the comments updated since `since` across the repository and groups them by issue number,
+# shaped like `gh issue view` comments. Returns (comments by issue, unparsable lines, error text).
+def fetch_recent_comments_by_issue(repo_slug, since):
+    endpoint = 'repos/{}/issues/comments?since={}&per_page=100'.format(repo_slug, since.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    items, bad_lines, error_text, status_code, _ = gh_api_list(endpoint, 'issue_comments_bulk')
+    if items is None:
+        return None, [], error_text or 'HTTP {}'.format(status_code)
+    comments_by_issue = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        match = re.search(r'/issues/(\d+)$', str(item.get('issue_url') or ''))
+        if not match:
+            continue
+        comments_by_issue.setdefault(int(match.group(1)), []).append({
+            'id': item.get('id'),
+            'url': item.get('html_url'),
+            'createdAt': item.get('created_at'),
+            'author': item.get('user'),
+            'reactions': item.get('reactions'),
+        })
+    return comments_by_issue, bad_lines, None
+
+
+INCREMENTAL_STATE_VERSION = 2
+
+
+def load_incremental_state(path, repo_slug, remove_label_normalized):
+    empty_state = {'issues': {}, 'wiki': {}}
+    if not path:
+        return empty_state
+    state = read_json_file(path)
+    if not isinstance(state, dict):
+        return empty_state
+    params = {'repo': repo_slug, 'remove_label': remove_label_normalized}
+    if state.get('version') != INCREMENTAL_STATE_VERSION or state.get('params') != params:
+        print('Incremental state was written for different parameters. Starting from scratch.')
+        return empty_state
+    issues = state.get('issues') if isinstance(state.get('issues'), dict) else {}
+    wiki = state.get('wiki') if isinstance(state.get('wiki'), dict) else {}
+    return {'issues': issues, 'wiki': wiki}
+
+
+def save_incremental_state(path, repo_slug, remove_label_normalized, issues, wiki):
+    write_json_atomic(path, {
+        'version': INCREMENTAL_STATE_VERSION,
+        'params': {'repo': repo_slug, 'remove_label': remove_label_normalized},
+        'issues': issues,
+        'wiki': wiki,
+    })
+
+
+def encode_issue_events(events, startday):
+    # Events at or before the report window can never count again, so they are dropped from the state.
+    return [
+        [kind, login, created_at.isoformat(), receiver]
+        for kind, login, created_at, receiver in events
+        if created_at > startday
+    ]
+
+
+def decode_reaction_targets(raw_targets):
+    targets = []
+    for raw_target in raw_targets if isinstance(raw_targets, list) else []:
+        if not isinstance(raw_target, list) or len(raw_target) != 3:
+            continue
+        kind, target_id, author_login = raw_target
+        if kind not in ('issue', 'comment') or not isinstance(target_id, int):
+            continue
+        targets.append((kind, target_id, author_login if isinstance(author_login, str) else ''))
+    return targets
+
+
+def decode_issue_events(raw_events):
+    events = []
+    for raw_event in raw_events if isinstance(raw_events, list) else []:
+        if not isinstance(raw_event, list) or len(raw_event) != 4:
+            continue
+        kind, login, created_at_raw, receiver = raw_event
+        if kind not in ('contribution', 'reaction') or not isinstance(login, str):
+            continue
+        try:
+            created_at = parse_github_timestamp(created_at_raw)
+        except ValueError:
+            continue
+        events.append((kind, login, created_at, receiver if isinstance(receiver, str) else None))
+    return events
+
+
+def is_wiki_page_update(status, filename):
+    return filename.endswith('.md') and (status in ['A', 'M'] or status.startswith('R') or status.startswith('C'))
+
+
+def iter_split_bytes(chunks, separator):
+    # Separator-terminated records from a stream of byte chunks; only the unfinished record is kept between chunks.
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        records = pending.split(separator)
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+# Yields (hash, author email, author name, date, message, status, filename) for each file of
+# `git log -z --name-status` output written with WIKI_LOG_PRETTY_FORMAT. Headers start with \x01 and end with a newline before the first status;
+# every status and path is its own NUL-terminated token, with both paths given for renames and copies.
+def iter_wiki_log_z_entries(tokens):
+    tokens = iter(tokens)
+    current_commit = None
+    for token in tokens:
+        if token[:1] == b'\x01':
+            fields = [token[1:]] + [next(tokens, b'') for _ in range(4)]
+            subject, _, token = fields[4].partition(b'\n')
+            commit_hash, author_email, author_name, commit_date = (field.decode('utf8', 'replace') for field in fields[:4])
+            current_commit = None
+            if WIKI_COMMIT_HASH_PATTERN.match(commit_hash):
+                current_commit = (commit_hash, author_email, author_name, commit_date, subject.decode('utf8', 'replace'))
+        if not token or current_commit is None:
+            continue
+        status = token.decode('ascii', 'replace')
+        filename = next(tokens, b'')
+        if status[:1] in ('R', 'C'):
+            filename = next(tokens, b'')
+        yield current_commit + (status, filename.decode('utf8', 'replace'))
+
+
+# Consumes streamed `git log -z` output, keeping only page creations/updates and the newest commit hash seen.
+def collect_wiki_page_updates(chunks):
+    newest_commit = ''
+    page_updates = []
+    for entry in iter_wiki_log_z_entries(iter_split_bytes(chunks, b'\x00')):
+        newest_commit = newest_commit or entry[0]
+        if is_wiki_page_update(entry[5], entry[6]):
+            page_updates.append(entry)
+    return newest_commit, page_updates
+
+
+# Report text is assembled from these templates as lists of fragments and joined once per file.
+REPORT_TEMPLATES = {
+    'wiki_header': '### Wiki updates (last {num_day:,} days)\n',
+    'wiki_intro': 'The following wiki pages were created or updated:\n\n',
+    'wiki_page': '- **[{name}]({url})** - {action} on {date} by {author}\n',
+    'wiki_footer': '\n',
+    'wiki_empty': 'No wiki pages were created or updated in the last {num_day:,} days.\n\n',
+    'issue_header': '### Issue summary\nThe following lists include the issues that have been inactive for more than {inactive_days:,} days.\n\n',
+    'issue_item': '{url} ({days} days)',
+    'assignee_issues': '@{assignee}: {issues}\n',
+    'assignee_no_issues': '@{assignee}: no inactive assigned issues.\n',
+    'assignee_assigned_link': '[List of open issues where @{assignee} is assigned]({url})\n',
+    'assignee_mentioned_link': '[List of open issues where @{assignee} is not assigned but mentioned]({url})\n',
+    'assignee_thanks': 'Thank you for your {num_comment:,} contributions on {num_issue:,} issues, writing in {num_wiki_pages:,} wiki pages, and giving {reactions_given:,} reactions in the last {num_day:,} days!\n',
+    'assignee_footer': '\n',
+    'no_unassigned': 'There is no unassigned issue.\n',
+    'unassigned_issues': 'There are {count} unassigned issues. If anyone is willing to voluntarily take care of these, it would be very helpful: {issues}\n\n',
+}
+
+
+def inactive_days(issue, now_ts):
+    return int((now_ts - issue.unix_timestamp_updated) / 86400)
+
+
+def render_issue_list(issues, now_ts):
+    item = REPORT_TEMPLATES['issue_item']
+    return ', '.join([item.format(url=issue.issue_url, days=inactive_days(issue, now_ts)) for issue in issues])
+
+
+def render_wiki_section(wiki_pages, num_day, repo_web_url):
+    parts = [REPORT_TEMPLATES['wiki_header'].format(num_day=num_day)]
+    if not wiki_pages:
+        parts.append(REPORT_TEMPLATES['wiki_empty'].format(num_day=num_day))
+        return ''.join(parts)
+    parts.append(REPORT_TEMPLATES['wiki_intro'])
+    page_template = REPORT_TEMPLATES['wiki_page']
+    # Sort by date (most recent first)
+    for page in sorted(wiki_pages, key=lambda x: x['date'], reverse=True):
+        parts.append(page_template.format(
+            name=page['name'],
+            url=repo_web_url + '/wiki/' + page['name'].replace(' ', '-'),
+            action=page['action'],
+            date=page['date'],
+            author=page['author'],
+        ))
+    parts.append(REPORT_TEMPLATES['wiki_footer'])
+    return ''.join(parts)
+
+
 print('Starting write_issue_report.py')
+start_phase('ingest')
 
 if len(sys.argv) != 6:
     raise SystemExit('Usage: write_issue_report.py <gh_out_file> <inactive_days> <remove_label> <issue_hyperlink yes/no> <repo_url>')
@@ -403,47 +1755,49 @@ current_unix_timestamp = int(current_utc.replace(tzinfo=datetime.timezone.utc).t
 
 since_last_updated_sec = since_last_updated_day * 86400
 
-with open(hub_out_file, 'r') as f:
-    hub_txt = f.read()
-
-hub_txt = hub_txt.lstrip('\ufeff')
 issues = list()
-hub_txt_stripped = hub_txt.lstrip()
-if hub_txt_stripped.startswith('[') or hub_txt_stripped.startswith('{'):
+with open(hub_out_file, 'r') as f:
+    # Only the start of the file is needed to tell the formats apart; JSON arrays and NDJSON are then decoded record by record.
+    # The first line is only needed to tell NDJSON from a lone object; `gh --json` writes an array on one line when piped.
+    hub_txt = f.read(JSON_STREAM_CHUNK_SIZE).lstrip('\ufeff')
+    while hub_txt and (not hub_txt.strip() or (hub_txt.lstrip().startswith('{') and '\n' not in hub_txt.lstrip())):
+        chunk = f.read(JSON_STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        hub_txt += chunk
+    hub_format = detect_issue_input_format(hub_txt, hub_out_file)
+    now_ts = current_unix_timestamp
+    if hub_format == 'json_array':
+        try:
+            for i, issue_record in enumerate(iter_json_array(f, hub_txt.lstrip())):
+                try:
+                    issue = issue_from_json_record(issue_record, now_ts, repo_web_url)
+                except (KeyError, TypeError, ValueError) as exc:
+                    print('Warning: Skipping malformed issue JSON row index {}: {}'.format(i, exc))
+                    continue
+                issues.append(issue)
+        except json.JSONDecodeError as exc:
+            raise SystemExit('Failed to parse issue JSON from {}: {}'.format(hub_out_file, exc))
+    elif hub_format == 'ndjson':
+        # Lines are independent, so a listing cut short (e.g. by rate limiting) still yields every complete record.
+        for line_number, line in enumerate(iter_text_lines(hub_txt, f), start=1):
+            if not line.strip():
+                continue
+            try:
+                issue = issue_from_json_record(json.loads(line), now_ts, repo_web_url)
+            except (KeyError, TypeError, ValueError) as exc:
+                print('Warning: Skipping malformed issue JSON line {}: {}'.format(line_number, exc))
+                continue
+            issues.append(issue)
+    else:
+        hub_txt += f.read()
+if hub_format == 'json_object':
     try:
-        issue_records = json.loads(hub_txt)
+        json.loads(hub_txt)
     except json.JSONDecodeError as exc:
         raise SystemExit('Failed to parse issue JSON from {}: {}'.format(hub_out_file, exc))
-    if not isinstance(issue_records, list):
-        raise SystemExit('Expected JSON array in {}'.format(hub_out_file))
-    now_ts = current_unix_timestamp
-    for i, issue_record in enumerate(issue_records):
-        try:
-            issue_number = int(issue_record['number'])
-            updated_at = issue_record['updatedAt']
-            updated_dt = parse_github_timestamp(updated_at)
-            unix_timestamp_updated = int(updated_dt.replace(tzinfo=datetime.timezone.utc).timestamp())
-            assignees = extract_assignee_logins(issue_record.get('assignees', []))
-            labels = extract_label_names(issue_record.get('labels', []))
-            if not labels:
-                labels = ['']
-            issue_title = issue_record.get('title', '')
-            issue_url = issue_record.get('url', '')
-            if not issue_url:
-                issue_url = '{}/issues/{}'.format(repo_web_url, issue_number)
-        except (KeyError, TypeError, ValueError) as exc:
-            print('Warning: Skipping malformed issue JSON row index {}: {}'.format(i, exc))
-            continue
-        issues.append({
-            'issue_number': issue_number,
-            'assignees': assignees,
-            'relative_time_updated': format_relative_elapsed(max(0.0, now_ts - unix_timestamp_updated)),
-            'unix_timestamp_updated': unix_timestamp_updated,
-            'issue_title': issue_title,
-            'issue_url': issue_url,
-            'labels': labels
-        })
-else:
+    raise SystemExit('Expected JSON array in {}'.format(hub_out_file))
+elif hub_format == 'legacy':
     hub_items = hub_txt.split('\n')
     if hub_items[len(hub_items)-1]=='':
         hub_items = hub_items[0:(len(hub_items)-1)]
@@ -464,71 +1818,109 @@ else:
         issue_url = issue_items[5]
         if not issue_url:
             issue_url = '{}/issues/{}'.format(repo_web_url, issue_number)
-        issues.append({
-            'issue_number': issue_number,
-            'assignees': assignees,
-            'relative_time_updated': issue_items[2],
-            'unix_timestamp_updated': unix_timestamp_updated,
-            'issue_title': issue_items[4],
-            'issue_url': issue_url,
-            'labels': labels
-        })
+        issues.append(IssueRecord(
+            issue_number,
+            assignees,
+            issue_items[2],
+            unix_timestamp_updated,
+            issue_items[4],
+            issue_url,
+            labels,
+        ))
 
 print('Number of open Issues: {:,}'.format(len(issues)))
 if not generate_issue_hyperlink:
     print('Issue hyperlinks will not be generated.')
-    for i in range(len(issues)):
+    for issue in issues:
         # https://github.com/hackmdio/hackmd-io-issues/issues/261
-        issues[i]['issue_url'] = re.sub('.*/', '#<span/>', issues[i]['issue_url'])
+        issue.issue_url = re.sub('.*/', '#<span/>', issue.issue_url)
 
-inactive_issues = [ issue for issue in issues if (current_unix_timestamp-issue['unix_timestamp_updated']) > since_last_updated_sec ]
-inactive_issues = [ issue for issue in inactive_issues if not has_label_case_insensitive(issue['labels'], remove_label_normalized) ]
+inactive_issues = [
+    issue for issue in issues
+    if (current_unix_timestamp-issue.unix_timestamp_updated) > since_last_updated_sec and remove_label_normalized not in issue.label_keys
+]
 print('Number of inactive Issues: {:,}'.format(len(inactive_issues)))
+# Lowercased assignee -> inactive issues in listing order, built in one pass for the summary and assignee_*.txt files.
+inactive_issues_by_assignee = {}
+for issue in inactive_issues:
+    for assignee_key in issue.assignee_keys:
+        inactive_issues_by_assignee.setdefault(assignee_key, []).append(issue)
 
-assignee_candidates = [assignee.strip() for issue in inactive_issues for assignee in issue['assignees'] if assignee.strip() != '']
+assignee_candidates = [assignee.strip() for issue in inactive_issues for assignee in issue.assignees if assignee.strip() != '']
 unique_assignees = unique_case_insensitive(assignee_candidates)
 print('Number of assignees in inactive Issues: {:,}'.format(len(unique_assignees)))
 assignee_filename_map = unique_filename_components(unique_assignees)
 unique_assignee_txt = ','.join(unique_assignees)
-with open('unique_assignees.txt', 'w') as f:
-    f.write(unique_assignee_txt + '\n')
-
-# Clean up stale per-assignee summaries before writing fresh ones
-for assignee_file in glob.glob('assignee_*.txt'):
-    try:
-        os.remove(assignee_file)
-    except OSError as exc:
-        print('Failed to remove {}: {}'.format(assignee_file, exc))
+# Output files are collected here and written together at the end; issue_report.txt goes in last.
+report_outputs = {'unique_assignees.txt': unique_assignee_txt + '\n'}
 
 # Member-wise contributions in the last X days
 num_day = 7
 today = current_utc
-today_str = today.strftime('%Y-%m-%d')
 startday = current_utc - datetime.timedelta(days=num_day)
-startday_str = startday.strftime('%Y-%m-%d')
-gh_command1 = [
-    'gh', 'issue', 'list',
-    '--limit', str(100000),
-    '--state', 'all',
-    '--search', 'updated:{}..{}'.format(startday_str, today_str),
-    '--json', 'number',
-    '--jq', '.[].number'
-]
-gh_command1_str = ' '.join(gh_command1)
-print('gh command: {}'.format(gh_command1_str))
-gh_out1 = subprocess.run(gh_command1, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-recent_issue_nums = []
-if gh_out1.returncode != 0:
-    print('Warning: gh command failed: {}'.format(gh_out1.stderr.decode('utf8').strip()))
+# Rate-limited gh calls are retried; past the reserve, comment reaction lookups give way to everything else.
+gh_max_retries = read_int_env('GH_MAX_RETRIES', 4)
+gh_retry_base_delay_sec = read_int_env('GH_RETRY_BASE_DELAY_MS', 1000) / 1000.0
+gh_retry_max_delay_sec = read_int_env('GH_RETRY_MAX_DELAY_SEC', 60)
+gh_rate_limit_reserve = read_int_env('GH_RATE_LIMIT_RESERVE', 100)
+github_api_transport = read_choice_env('GITHUB_API_TRANSPORT', 'gh', ('gh', 'http'))
+github_api_token = os.environ.get('GITHUB_TOKEN', '').strip() or os.environ.get('GH_TOKEN', '').strip()
+if github_api_transport == 'http' and not github_api_token:
+    print('Warning: GITHUB_API_TRANSPORT=http requires GITHUB_TOKEN. Using gh instead.')
+    github_api_transport = 'gh'
+github_api_url = os.environ.get('GITHUB_API_URL', '').strip().rstrip('/') or 'https://api.github.com'
+github_graphql_url = os.environ.get('GITHUB_GRAPHQL_URL', '').strip() or github_api_url + '/graphql'
+# Issue counts for the forum body are written as KEY=VALUE lines the workflow sources; disabled when unset.
+issue_stats_path = os.environ.get('ISSUE_STATS_FILE', '').strip()
+issue_stats_txt = ''
+if issue_stats_path:
+    start_phase('issue_stats')
+    issue_stats, issue_stats_error = fetch_issue_stats(repo_slug)
+    if issue_stats:
+        print('Open issues: {:,}, closed issues: {:,}'.format(issue_stats['open'], issue_stats['closed']))
+        issue_stats_txt = 'NUM_OPEN_ISSUE={}\nNUM_CLOSE_ISSUE={}\n'.format(issue_stats['open'], issue_stats['closed'])
+    else:
+        print('Warning: Could not get issue counts: {}'.format(issue_stats_error))
+# 'comments' reads comments from one repository-wide listing and issue fields from the issue listing,
+# instead of fetching every recently updated issue in full ('issues').
+issue_contribution_source = read_choice_env('ISSUE_CONTRIBUTION_SOURCE', 'issues', ('issues', 'comments'))
+# 'involves' scans only issues that an `involves:<assignee>` search finds; reactions an assignee leaves on an
+# issue they are otherwise not part of are then missed. 'all' scans every recently updated issue.
+issue_scan_planner = read_choice_env('ISSUE_SCAN_PLANNER', 'all', ('all', 'involves'))
+# gh lookups run on a bounded thread pool; results are merged in scan order so the report matches a serial run.
+gh_max_concurrency = read_int_env('GH_MAX_CONCURRENCY', 1, minimum=1)
+start_phase('issue_listing')
+if issue_contribution_source == 'comments':
+    issue_listing_fields = ['--json', 'number,updatedAt,createdAt,author,labels,reactionGroups', '--jq', '.[]']
 else:
-    for rin in gh_out1.stdout.decode('utf8').split('\n'):
-        rin = rin.strip()
-        if rin == '':
-            continue
-        if rin.isdigit():
-            recent_issue_nums.append(int(rin))
-        else:
-            print('Warning: Non-numeric issue identifier from gh output: {}'.format(rin))
+    issue_listing_fields = ['--json', 'number,updatedAt', '--jq', '.[] | [.number, .updatedAt] | @tsv']
+recent_issue_window = (
+    datetime.datetime.combine(startday.date(), datetime.time(0)),
+    datetime.datetime.combine(today.date(), datetime.time(23, 59, 59)),
+)
+recent_issue_lines = enumerate_recent_issue_lines(*recent_issue_window, issue_listing_fields, gh_max_concurrency)
+recent_issue_nums = []
+# updatedAt from the listing validates cached issue payloads
+recent_issue_updated_at = {}
+# Issue fields from a JSON listing (ISSUE_CONTRIBUTION_SOURCE=comments), keyed by issue number
+recent_issue_details = {}
+for rin in recent_issue_lines:
+    rin = rin.strip()
+    if rin.startswith('{'):
+        try:
+            rin_details = json.loads(rin)
+        except json.JSONDecodeError:
+            rin_details = None
+        if isinstance(rin_details, dict) and isinstance(rin_details.get('number'), int):
+            recent_issue_details.setdefault(rin_details['number'], rin_details)
+            rin = '{}\t{}'.format(rin_details['number'], rin_details.get('updatedAt') or '')
+    rin_fields = rin.split('\t')
+    if rin_fields[0].isdigit():
+        recent_issue_nums.append(int(rin_fields[0]))
+        if len(rin_fields) >= 2 and rin_fields[1].strip():
+            recent_issue_updated_at.setdefault(int(rin_fields[0]), rin_fields[1].strip())
+    else:
+        print('Warning: Non-numeric issue identifier from gh output: {}'.format(rin))
 recent_issue_nums = list(dict.fromkeys(recent_issue_nums))
 print('Issues updated in the last {:,} days: {}'.format(num_day, ', '.join([ str(r) for r in recent_issue_nums ])))
 recent_contributions = dict()
@@ -544,19 +1936,17 @@ for assignee in unique_assignees:
     recent_contributions[assignee]['reactions_given'] = 0
     recent_contributions[assignee]['reactions_received'] = 0
 comment_reaction_lookup_count = 0
-max_comment_reaction_lookups = 500
-max_comment_reaction_lookups_env = os.environ.get('MAX_COMMENT_REACTION_LOOKUPS', '')
-if max_comment_reaction_lookups_env != '':
-    try:
-        max_comment_reaction_lookups = int(max_comment_reaction_lookups_env)
-    except ValueError:
-        print('Warning: Invalid MAX_COMMENT_REACTION_LOOKUPS value: {}. Using default {}.'.format(max_comment_reaction_lookups_env, max_comment_reaction_lookups))
-if max_comment_reaction_lookups < 0:
-    print('Warning: Negative MAX_COMMENT_REACTION_LOOKUPS value: {}. Using 0.'.format(max_comment_reaction_lookups))
-    max_comment_reaction_lookups = 0
+max_comment_reaction_lookups = read_int_env('MAX_COMMENT_REACTION_LOOKUPS', 500)
 comment_reaction_limit_warned = False
 comment_reaction_id_warned = False
 scan_issue_nums = recent_issue_nums
+if issue_scan_planner == 'involves' and unique_assignees and scan_issue_nums:
+    participant_issue_nums, participant_error = find_participant_issue_nums(repo_slug, unique_assignees, recent_issue_window)
+    if participant_issue_nums is None:
+        print('Warning: Participant search failed: {}. Scanning all recently updated issues.'.format(participant_error))
+    else:
+        scan_issue_nums = [issue_num for issue_num in scan_issue_nums if issue_num in participant_issue_nums]
+        print('Scan planner kept {:,} of {:,} recently updated issues.'.format(len(scan_issue_nums), len(recent_issue_nums)))
 max_recent_issues_to_scan = 2000
 if len(scan_issue_nums) > max_recent_issues_to_scan:
     print('Warning: Trimming recent issue scan from {:,} to {:,} issues.'.format(len(scan_issue_nums), max_recent_issues_to_scan))
@@ -565,16 +1955,119 @@ if not unique_assignees:
     if recent_issue_nums:
         print('No assignees in inactive issues. Skipping contribution and reaction scan.')
     scan_issue_nums = []
+# Issue payloads are fetched in GraphQL batches; 'view' restores one `gh issue view` call per issue.
+issue_fetch_mode = read_choice_env('ISSUE_FETCH_MODE', 'graphql', ('graphql', 'view'))
+graphql_issue_batch_size = min(read_int_env('GRAPHQL_ISSUE_BATCH_SIZE', 50, minimum=1), 100)
+# Reaction lookups are queued as (kind, target id, endpoint, issue number, author login, cache path, cache entry)
+# and run after the payload pass.
+reaction_lookups = []
+# Issues and comments whose reactions need a lookup, per issue number: (kind, target id, author login)
+reaction_candidates = {}
+# Every issue and comment that can receive reactions, per issue number; kept in the incremental state so that
+# reactions on reused issues are revalidated.
+reaction_targets = {}
+cached_reaction_results = []
+# Reactions that came inline with GraphQL issue payloads need no lookup: (issue number, author login, reactions)
+inline_reaction_results = []
+start_phase('issue_scan')
+# Optional persistent cache shared between workflow runs (restored through actions/cache).
+report_cache_dir = os.environ.get('REPORT_CACHE_DIR', '').strip()
+issue_cache_dir = os.path.join(report_cache_dir, 'issue_views') if report_cache_dir else ''
+reaction_cache_dir = os.path.join(report_cache_dir, 'reactions') if report_cache_dir else ''
+# Incremental mode keeps contribution events and the last wiki commit between runs, so only changes are processed.
+try:
+    incremental_report = parse_bool(os.environ.get('INCREMENTAL_REPORT', 'no'))
+except ValueError as exc:
+    print('Warning: {}. Incremental mode is disabled.'.format(exc))
+    incremental_report = False
+if incremental_report and not report_cache_dir:
+    print('Warning: INCREMENTAL_REPORT requires REPORT_CACHE_DIR. Incremental mode is disabled.')
+    incremental_report = False
+incremental_state_path = os.path.join(report_cache_dir, 'report_state.json') if incremental_report else ''
+incremental_state = load_incremental_state(incremental_state_path, repo_slug, remove_label_normalized)
+# Contribution events per issue: (kind, login, created_at, receiver login); logins are matched to assignees afterwards.
+issue_events = {}
+# Issues whose events may be missing data this run; they are not persisted so the next run retries them.
+incomplete_issue_nums = set()
 for issue_num in scan_issue_nums:
-    gh_command2 = ['gh', 'issue', 'view', str(issue_num), '--json', 'assignees,author,body,closed,closedAt,comments,createdAt,id,labels,milestone,number,reactionGroups,state,title,updatedAt,url']
-    gh_out2 = subprocess.run(gh_command2, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    if gh_out2.returncode != 0:
-        print('gh command failed (issue {}): {}'.format(issue_num, gh_out2.stderr.decode('utf8').strip()))
-        continue
-    try:
-        issue = json.loads(gh_out2.stdout.decode('utf8'))
-    except json.JSONDecodeError:
-        print('Warning: Could not parse issue JSON for issue {}'.format(issue_num))
+    state_entry = incremental_state['issues'].get(str(issue_num))
+    listing_updated_at = recent_issue_updated_at.get(issue_num)
+    if isinstance(state_entry, dict) and listing_updated_at and state_entry.get('updatedAt') == listing_updated_at:
+        # Adding a reaction does not change updatedAt, so only contributions are reused; reactions are refreshed
+        # below together with those of cached issue views.
+        issue_events[issue_num] = [event for event in decode_issue_events(state_entry.get('events')) if event[0] == 'contribution']
+        reaction_targets[issue_num] = decode_reaction_targets(state_entry.get('reactionTargets'))
+if incremental_report:
+    print('Incremental state reused for {:,} of {:,} issues'.format(len(issue_events), len(scan_issue_nums)))
+reused_issue_nums = [issue_num for issue_num in scan_issue_nums if issue_num in issue_events]
+process_issue_nums = [issue_num for issue_num in scan_issue_nums if issue_num not in issue_events]
+# Payloads assembled from the issue listing and the repository-wide comment listing. Comments written before the
+# window are not listed, so reactions added to them during the window are not counted in this mode.
+listing_issue_payloads = {}
+if issue_contribution_source == 'comments' and process_issue_nums:
+    comments_by_issue, bad_comment_lines, comments_error = fetch_recent_comments_by_issue(repo_slug, startday)
+    for line in bad_comment_lines:
+        print('Warning: Could not parse comment JSON: {}'.format(line[:100]))
+    if comments_by_issue is None:
+        print('Warning: Could not list recent comments: {}. Fetching issues one by one instead.'.format(comments_error))
+    else:
+        for issue_num in process_issue_nums:
+            if issue_num in recent_issue_details:
+                listing_issue_payloads[issue_num] = dict(recent_issue_details[issue_num], comments=comments_by_issue.get(issue_num, []))
+        print('Recent comments listed for {:,} of {:,} issues'.format(len(listing_issue_payloads), len(process_issue_nums)))
+cached_issue_payloads = {}
+if issue_cache_dir:
+    for issue_num in process_issue_nums:
+        if issue_num in listing_issue_payloads:
+            continue
+        cached_payload = load_cached_issue_view(issue_cache_dir, issue_num, recent_issue_updated_at.get(issue_num))
+        if cached_payload is not None:
+            cached_issue_payloads[issue_num] = cached_payload
+    print('Issue view cache hits: {:,} of {:,}'.format(len(cached_issue_payloads), len(process_issue_nums) - len(listing_issue_payloads)))
+fetched_issue_payloads = dict(fetch_issue_payloads(
+    repo_slug,
+    [issue_num for issue_num in process_issue_nums if issue_num not in cached_issue_payloads and issue_num not in listing_issue_payloads],
+    issue_fetch_mode,
+    graphql_issue_batch_size,
+    gh_max_concurrency,
+))
+if issue_cache_dir:
+    for issue_num, payload in fetched_issue_payloads.items():
+        if isinstance(payload, dict):
+            store_cached_issue_view(issue_cache_dir, issue_num, payload.get('updatedAt') or recent_issue_updated_at.get(issue_num), payload)
+    evict_cache_dir(
+        issue_cache_dir,
+        read_int_env('ISSUE_CACHE_MAX_AGE_DAYS', 30) * 86400,
+        read_int_env('ISSUE_CACHE_MAX_MB', 200) * 1024 * 1024,
+    )
+# Reactions do not change updatedAt, so cached payloads only supply comments, authors and labels, and reused issues
+# only contributions. In graphql mode their reactions are refreshed in batches like the issues themselves; what is
+# left is looked up over REST.
+refreshed_reactions = {}
+refresh_issue_nums = reused_issue_nums + [issue_num for issue_num in process_issue_nums if issue_num in cached_issue_payloads]
+if issue_fetch_mode == 'graphql' and refresh_issue_nums:
+    refresh_batches = [refresh_issue_nums[i:i + graphql_issue_batch_size] for i in range(0, len(refresh_issue_nums), graphql_issue_batch_size)]
+    for batch_reactions, messages in run_concurrently(lambda batch: fetch_reaction_batch_graphql(repo_slug, batch), refresh_batches, gh_max_concurrency):
+        for message in messages:
+            print(message)
+        if batch_reactions is not None:
+            refreshed_reactions.update(batch_reactions)
+    print('Reactions refreshed for {:,} of {:,} cached or reused issues'.format(len(refreshed_reactions), len(refresh_issue_nums)))
+for issue_num in reused_issue_nums:
+    known_reactions = refreshed_reactions.get(issue_num, {})
+    for kind, target_id, author_login in reaction_targets[issue_num]:
+        target_reactions = known_reactions.get((kind, target_id))
+        if target_reactions is None:
+            reaction_candidates.setdefault(issue_num, []).append((kind, target_id, author_login))
+        elif target_reactions:
+            inline_reaction_results.append((issue_num, author_login, target_reactions))
+            seed_reaction_cache(reaction_cache_dir, kind, target_id, target_reactions)
+for issue_num in process_issue_nums:
+    if issue_num in listing_issue_payloads:
+        issue = listing_issue_payloads[issue_num]
+    else:
+        issue = cached_issue_payloads[issue_num] if issue_num in cached_issue_payloads else fetched_issue_payloads.get(issue_num)
+    if issue is None:
         continue
     if not isinstance(issue, dict):
         print('Warning: Unexpected issue payload type for issue {}: {}'.format(issue_num, type(issue).__name__))
@@ -588,51 +2081,32 @@ for issue_num in scan_issue_nums:
     except ValueError:
         print('Warning: Invalid createdAt for issue {}: {}'.format(issue_num, issue_created_at_raw))
         continue
+    events = issue_events.setdefault(issue_num, [])
+    targets = reaction_targets.setdefault(issue_num, [])
+    candidates = reaction_candidates.setdefault(issue_num, [])
+    # Reactions known for this issue and its comments: None leaves a target to a REST lookup.
+    reactions_are_fresh = issue_num not in cached_issue_payloads
+    known_reactions = refreshed_reactions.get(issue_num, {})
     issue_author = extract_login(issue.get('author'))
     issue_labels = extract_label_names(issue.get('labels', []))
     if has_label_case_insensitive(issue_labels, remove_label_normalized):
         print('Skipping issue {} from contribution scan because it has label {}'.format(issue_num, remove_label))
         continue
-    matched_issue_author = assignee_lookup.get(issue_author.lower()) if issue_author else None
-    if (issue_created_at > startday) and matched_issue_author:
-        recent_contributions[matched_issue_author]['issue_numbers'].append(issue_num)
-        recent_contributions[matched_issue_author]['timestamps'].append(issue_created_at)
+    if issue_author:
+        events.append(('contribution', issue_author, issue_created_at, None))
     
     # Track reactions on the issue itself
-    if has_positive_reactions(issue.get('reactionGroups')):
+    targets.append(('issue', issue_num, issue_author))
+    if reactions_are_fresh:
+        issue_reactions = issue.get('inlineReactions') if has_positive_reactions(issue.get('reactionGroups')) else []
+    else:
+        issue_reactions = known_reactions.get(('issue', issue_num))
+    if issue_reactions is None:
         # Get detailed reaction info to see who reacted
-        gh_command_reactions = ['gh', 'api', 'repos/{}/issues/{}/reactions'.format(repo_slug, issue_num), '--paginate', '--jq', '.[]']
-        gh_out_reactions = subprocess.run(gh_command_reactions, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if gh_out_reactions.returncode == 0:
-            # Parse newline-delimited JSON objects from --jq '.[]'
-            reactions = []
-            for line in gh_out_reactions.stdout.decode('utf8').strip().split('\n'):
-                if line.strip():
-                    try:
-                        reactions.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        print('Warning: Could not parse reaction JSON: {}'.format(line[:100]))
-            if reactions:
-                print('Found {} reactions on issue {}'.format(len(reactions), issue_num))
-            for reaction in reactions:
-                reaction_created_at_raw = reaction.get('created_at')
-                if not reaction_created_at_raw:
-                    continue
-                try:
-                    reaction_created_at = parse_github_timestamp(reaction_created_at_raw)
-                except ValueError:
-                    continue
-                reactor = extract_login(reaction.get('user'))
-                if (reaction_created_at > startday) and reactor:
-                    matched_reactor = assignee_lookup.get(reactor.lower())
-                    # Count reactions given
-                    if matched_reactor:
-                        recent_contributions[matched_reactor]['reactions_given'] += 1
-                    # Count reactions received by issue author
-                    if matched_issue_author:
-                        recent_contributions[matched_issue_author]['reactions_received'] += 1
-        else:
-            print('Warning: Could not fetch reactions for issue {}: {}'.format(issue_num, gh_out_reactions.stderr.decode('utf8').strip()))
+        candidates.append(targets[-1])
+    elif issue_reactions:
+        inline_reaction_results.append((issue_num, issue_author, issue_reactions))
+        seed_reaction_cache(reaction_cache_dir, 'issue', issue_num, issue_reactions)
     
     raw_comments = issue.get('comments')
     if not isinstance(raw_comments, list):
@@ -649,10 +2123,8 @@ for issue_num in scan_issue_nums:
         except ValueError:
             continue
         comment_author = extract_login(comment.get('author'))
-        matched_comment_author = assignee_lookup.get(comment_author.lower()) if comment_author else None
-        if (comment_created_at > startday) and matched_comment_author:
-            recent_contributions[matched_comment_author]['issue_numbers'].append(issue_num)
-            recent_contributions[matched_comment_author]['timestamps'].append(comment_created_at)
+        if comment_author:
+            events.append(('contribution', comment_author, comment_created_at, None))
         
         # Track reactions on comments
         has_comment_reactions = (
@@ -660,55 +2132,121 @@ for issue_num in scan_issue_nums:
             has_positive_reactions(comment.get('reactionGroups'))
         )
         comment_id = extract_comment_reaction_id(comment)
-        if has_comment_reactions and comment_id is not None:
+        if comment_id is not None:
+            targets.append(('comment', comment_id, comment_author))
+        if reactions_are_fresh:
+            comment_reactions = comment.get('inlineReactions') if has_comment_reactions else []
+        else:
+            comment_reactions = known_reactions.get(('comment', comment_id))
+        if comment_reactions:
+            inline_reaction_results.append((issue_num, comment_author, comment_reactions))
+            if comment_id is not None:
+                seed_reaction_cache(reaction_cache_dir, 'comment', comment_id, comment_reactions)
+        elif comment_reactions is None and comment_id is not None:
+            # Note: comment reactions are included in the issue view JSON, but we need to check if they have the detailed user info
+            # The reactionGroups in comments may not have user details, so we'll need to make an API call
+            candidates.append(targets[-1])
+        elif comment_reactions is None and has_comment_reactions:
+            if not comment_reaction_id_warned:
+                print('Warning: Could not determine numeric comment id for reaction lookup. Skipping affected comments.')
+                comment_reaction_id_warned = True
+
+for issue_num in scan_issue_nums:
+    for kind, target_id, author_login in reaction_candidates.get(issue_num, []):
+        reaction_cache_path = os.path.join(reaction_cache_dir, '{}_{}.json'.format(kind, target_id)) if reaction_cache_dir else ''
+        reaction_cache_entry = read_json_file(reaction_cache_path) if reaction_cache_path else None
+        if kind == 'issue':
+            reaction_lookups.append((kind, target_id, 'repos/{}/issues/{}/reactions'.format(repo_slug, target_id), issue_num, author_login, reaction_cache_path, reaction_cache_entry))
+            continue
+        # Revalidating a cached list with its ETag is free against the rate limit, so only full lookups count toward the cap.
+        # fetch_reactions only revalidates lists shorter than a page; longer ones are fetched in full.
+        is_revalidation = (
+            isinstance(reaction_cache_entry, dict) and bool(reaction_cache_entry.get('etag')) and
+            isinstance(reaction_cache_entry.get('reactions'), list) and len(reaction_cache_entry['reactions']) < REST_DEFAULT_PAGE_SIZE
+        )
+        if not is_revalidation:
             if comment_reaction_lookup_count >= max_comment_reaction_lookups:
                 if not comment_reaction_limit_warned:
                     print('Warning: Reached comment reaction lookup limit ({:,}). Skipping remaining comment reaction lookups.'.format(max_comment_reaction_lookups))
                     comment_reaction_limit_warned = True
+                incomplete_issue_nums.add(issue_num)
+                if isinstance(reaction_cache_entry, dict) and isinstance(reaction_cache_entry.get('reactions'), list):
+                    # Past the cap, fall back to the stale cached list instead of dropping the comment.
+                    cached_reaction_results.append((issue_num, author_login, reaction_cache_entry['reactions']))
                 continue
             comment_reaction_lookup_count += 1
-            # Note: comment reactions are included in the issue view JSON, but we need to check if they have the detailed user info
-            # The reactionGroups in comments may not have user details, so we'll need to make an API call
-            gh_command_comment_reactions = ['gh', 'api', 'repos/{}/issues/comments/{}/reactions'.format(repo_slug, comment_id), '--paginate', '--jq', '.[]']
-            gh_out_comment_reactions = subprocess.run(gh_command_comment_reactions, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if gh_out_comment_reactions.returncode == 0:
-                # Parse newline-delimited JSON objects from --jq '.[]'
-                comment_reactions = []
-                for line in gh_out_comment_reactions.stdout.decode('utf8').strip().split('\n'):
-                    if line.strip():
-                        try:
-                            comment_reactions.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            print('Warning: Could not parse comment reaction JSON: {}'.format(line[:100]))
-                for reaction in comment_reactions:
-                    reaction_created_at_raw = reaction.get('created_at')
-                    if not reaction_created_at_raw:
-                        continue
-                    try:
-                        reaction_created_at = parse_github_timestamp(reaction_created_at_raw)
-                    except ValueError:
-                        continue
-                    reactor = extract_login(reaction.get('user'))
-                    if (reaction_created_at > startday) and reactor:
-                        matched_reactor = assignee_lookup.get(reactor.lower())
-                        # Count reactions given
-                        if matched_reactor:
-                            recent_contributions[matched_reactor]['reactions_given'] += 1
-                        # Count reactions received by comment author
-                        if matched_comment_author:
-                            recent_contributions[matched_comment_author]['reactions_received'] += 1
-            else:
-                print('Warning: Could not fetch reactions for comment {}: {}'.format(comment_id, gh_out_comment_reactions.stderr.decode('utf8').strip()))
-        elif has_comment_reactions:
-            if not comment_reaction_id_warned:
-                print('Warning: Could not determine numeric comment id for reaction lookup. Skipping affected comments.')
-                comment_reaction_id_warned = True
+        reaction_lookups.append((kind, target_id, 'repos/{}/issues/comments/{}/reactions'.format(repo_slug, target_id), issue_num, author_login, reaction_cache_path, reaction_cache_entry))
+
+start_phase('reaction_lookups')
+# Issue reactions go first so that a scarce rate-limit budget is spent on them before comment reactions.
+reaction_lookups.sort(key=lambda lookup: lookup[0] != 'issue')
+reaction_results = run_concurrently(fetch_reaction_lookup, reaction_lookups, gh_max_concurrency)
+reaction_sets = []
+for (kind, target_id, _, issue_num, author_login, _, _), (reactions, bad_lines, error_text) in zip(reaction_lookups, reaction_results):
+    if reactions is None:
+        print('Warning: Could not fetch reactions for {} {}: {}'.format(kind, target_id, error_text))
+        incomplete_issue_nums.add(issue_num)
+        continue
+    for line in bad_lines:
+        if kind == 'issue':
+            print('Warning: Could not parse reaction JSON: {}'.format(line[:100]))
+        else:
+            print('Warning: Could not parse comment reaction JSON: {}'.format(line[:100]))
+    if kind == 'issue' and reactions:
+        print('Found {} reactions on issue {}'.format(len(reactions), target_id))
+    reaction_sets.append((issue_num, author_login, reactions))
+if reaction_cache_dir:
+    evict_cache_dir(
+        reaction_cache_dir,
+        read_int_env('REACTION_CACHE_MAX_AGE_DAYS', 90) * 86400,
+        read_int_env('REACTION_CACHE_MAX_MB', 50) * 1024 * 1024,
+    )
+for issue_num, author_login, reactions in reaction_sets + cached_reaction_results + inline_reaction_results:
+    for reaction in reactions:
+        reaction_created_at_raw = reaction.get('created_at')
+        if not reaction_created_at_raw:
+            continue
+        try:
+            reaction_created_at = parse_github_timestamp(reaction_created_at_raw)
+        except ValueError:
+            continue
+        reactor = extract_login(reaction.get('user'))
+        if reactor:
+            issue_events[issue_num].append(('reaction', reactor, reaction_created_at, author_login))
+
+for issue_num in scan_issue_nums:
+    for kind, login, created_at, receiver in issue_events.get(issue_num, []):
+        if created_at <= startday:
+            continue
+        matched_login = assignee_lookup.get(login.lower())
+        if kind == 'contribution':
+            if matched_login:
+                recent_contributions[matched_login]['issue_numbers'].append(issue_num)
+                recent_contributions[matched_login]['timestamps'].append(created_at)
+            continue
+        # Count reactions given
+        if matched_login:
+            recent_contributions[matched_login]['reactions_given'] += 1
+        # Count reactions received by the issue or comment author
+        matched_receiver = assignee_lookup.get(receiver.lower()) if receiver else None
+        if matched_receiver:
+            recent_contributions[matched_receiver]['reactions_received'] += 1
 for assignee in unique_assignees:
     recent_contributions[assignee]['num_issue'] = len(set(recent_contributions[assignee]['issue_numbers']))
     recent_contributions[assignee]['num_comment'] = len(recent_contributions[assignee]['issue_numbers'])
 
+start_phase('wiki')
 # Get Wiki updates from the last week
 wiki_pages = []
+wiki_state = incremental_state['wiki']
+wiki_log_ok = False
+wiki_last_commit = ''
+updated_wiki_entries = []
+# Emails mapped to the logins they were matched to, kept in the cache directory so later runs can resolve
+# commits whose author name or address does not mention the login.
+wiki_author_logins_path = os.path.join(report_cache_dir, 'wiki_authors.json') if report_cache_dir else ''
+wiki_author_logins = load_wiki_author_logins(wiki_author_logins_path)
+loaded_wiki_author_logins = dict(wiki_author_logins)
 try:
     # Clone or update the wiki repository
     wiki_dir = 'wiki_temp'
@@ -717,174 +2255,200 @@ try:
     if github_token and wiki_url.startswith('https://'):
         wiki_url = wiki_url.replace('https://', 'https://x-access-token:{}@'.format(github_token), 1)
     
+    # 'shallow' keeps a bare, blob-less mirror cut near the report window; `git log --name-status` only needs trees
+    # as long as rename detection is off; it would fetch blobs from origin, which the token-less URL cannot reach.
+    wiki_clone_mode = read_choice_env('WIKI_CLONE_MODE', 'shallow', ('shallow', 'full'))
     if os.path.exists(wiki_dir):
         # Update existing wiki clone
         print('Updating existing wiki repository...')
         if github_token:
-            subprocess.run(['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url], check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        pull_result = subprocess.run(['git', '-C', wiki_dir, 'pull'], check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            run_command('git_remote', ['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url])
+        if os.path.exists(os.path.join(wiki_dir, '.git')):
+            update_result = run_command('git_pull', ['git', '-C', wiki_dir, 'pull'])
+        else:
+            # A cached shallow mirror only needs the commits made since the last run.
+            update_result = run_command('git_fetch', ['git', '-C', wiki_dir, 'fetch', '--prune', 'origin'])
         if github_token:
-            subprocess.run(['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url_public], check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if pull_result.returncode != 0:
-            print('Warning: Could not update wiki repository: {}'.format(pull_result.stderr.decode('utf8').strip()))
+            run_command('git_remote', ['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url_public])
+        if update_result.returncode != 0:
+            print('Warning: Could not update wiki repository: {}'.format(update_result.stderr.decode('utf8').strip()))
     else:
         # Clone the wiki repository
         print('Cloning wiki repository from {}...'.format(wiki_url_public))
-        result = subprocess.run(['git', 'clone', wiki_url, wiki_dir], check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if wiki_clone_mode == 'shallow':
+            shallow_options = ['--mirror', '--filter=blob:none']
+            shallow_since = (startday - datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+            result = run_command('git_clone', ['git', 'clone', wiki_url] + shallow_options + ['--shallow-since={}'.format(shallow_since), wiki_dir])
+            if result.returncode == 0:
+                # The oldest commit of a shallow clone has no parent and would list every page as added,
+                # so fetch one more commit beyond the cut.
+                run_command('git_fetch', ['git', '-C', wiki_dir, 'fetch', '--deepen=1', 'origin'])
+            else:
+                # --shallow-since fails when no commit is that recent; the latest commit is enough then.
+                result = run_command('git_clone', ['git', 'clone', wiki_url] + shallow_options + ['--depth=1', wiki_dir])
+        else:
+            result = run_command('git_clone', ['git', 'clone', wiki_url, wiki_dir])
         if result.returncode != 0:
             print('Warning: Could not clone wiki repository: {}'.format(result.stderr.decode('utf8').strip()))
         elif github_token:
-            subprocess.run(['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url_public], check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            run_command('git_remote', ['git', '-C', wiki_dir, 'remote', 'set-url', 'origin', wiki_url_public])
     
     if os.path.exists(wiki_dir):
-        # Get commits from the last 7 days with affected files
+        # Get commits from the last 7 days with affected files. A renamed page is listed as deleted and added,
+        # so it still counts as updated under its new name.
         since_date = startday.strftime('%Y-%m-%d')
-        git_log_cmd = ['git', '-C', wiki_dir, 'log', '--since={}'.format(since_date), '--name-status', '--pretty=format:%H|%ae|%an|%ad|%s', '--date=short']
-        result = subprocess.run(git_log_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        git_log_cmd = ['git', '-C', wiki_dir, 'log', '--since={}'.format(since_date), '-z', '--name-status', '--no-renames', WIKI_LOG_PRETTY_FORMAT, '--date=short']
+        # In incremental mode only commits after the last processed one are read; older page updates come from the state.
+        wiki_last_commit = wiki_state.get('last_commit') if isinstance(wiki_state.get('last_commit'), str) else ''
+        retained_wiki_entries = [
+            tuple(entry) for entry in (wiki_state.get('entries') if isinstance(wiki_state.get('entries'), list) else [])
+            if isinstance(entry, list) and len(entry) == 7 and isinstance(entry[3], str) and entry[3] >= since_date
+        ]
+        if WIKI_COMMIT_HASH_PATTERN.match(wiki_last_commit):
+            log_result = run_streaming_command('git_log', git_log_cmd[:4] + ['{}..HEAD'.format(wiki_last_commit)] + git_log_cmd[4:], collect_wiki_page_updates)
+            if log_result[0] != 0:
+                print('Warning: Could not read wiki log since {}. Reading the full window instead.'.format(wiki_last_commit))
+                retained_wiki_entries = []
+                log_result = run_streaming_command('git_log', git_log_cmd, collect_wiki_page_updates)
+        else:
+            retained_wiki_entries = []
+            log_result = run_streaming_command('git_log', git_log_cmd, collect_wiki_page_updates)
+        log_returncode, log_stderr, (newest_wiki_commit, wiki_entries) = log_result
         
-        if result.returncode == 0:
-            log_output = result.stdout.decode('utf8')
-            lines = log_output.strip().split('\n')
+        if log_returncode == 0:
+            if newest_wiki_commit:
+                wiki_last_commit = newest_wiki_commit
             
-            current_commit = None
             seen_pages = set()
+            # Authors repeat across commits, so each (email, name) pair is resolved once. Pairs left unmatched
+            # are resolved again after all pairs were seen, to use logins learned from other names for the same email.
+            resolved_wiki_authors = {}
+            for entry in wiki_entries + retained_wiki_entries:
+                author_key = (entry[1], entry[2])
+                if author_key not in resolved_wiki_authors:
+                    resolved_wiki_authors[author_key] = resolve_wiki_author(entry[1], entry[2], assignee_lookup, wiki_author_logins)
+            for author_key, (_, matched_assignee) in list(resolved_wiki_authors.items()):
+                if not matched_assignee:
+                    resolved_wiki_authors[author_key] = resolve_wiki_author(author_key[0], author_key[1], assignee_lookup, wiki_author_logins)
             
-            for line in lines:
-                if re.match(r'^[0-9a-fA-F]{6,40}\|', line):
-                    commit_info = parse_wiki_commit_line(line)
-                    if commit_info:
-                        author_candidates = wiki_author_candidates(
-                            commit_info['author_email'],
-                            commit_info['author_name'],
-                        )
-                        current_commit = {
-                            'hash': commit_info['hash'],
-                            'author': author_candidates[0] if author_candidates else '',
-                            'author_candidates': author_candidates,
-                            'author_email': commit_info['author_email'],
-                            'author_name': commit_info['author_name'],
-                            'date': commit_info['date'],
-                            'message': commit_info['message']
-                        }
-                elif line.strip() and current_commit:
-                    # This is a file change line (e.g., "M Page-Name.md" or "A New-Page.md")
-                    parts = line.strip().split('\t')
-                    if len(parts) >= 2:
-                        status = parts[0]  # A (added), M (modified), D (deleted)
-                        filename = parts[-1] if (status.startswith('R') or status.startswith('C')) and len(parts) >= 3 else parts[1]
-                        filename = decode_git_path(filename)
-                        
-                        # Convert filename to wiki page name (remove .md extension)
-                        if filename.endswith('.md'):
-                            page_name = filename[:-3].replace('-', ' ')
-                            page_key = (page_name, current_commit['date'])
-                            is_page_update = (status in ['A', 'M'] or status.startswith('R') or status.startswith('C'))
-                            if is_page_update:
-                                # Track wiki contributions per assignee, even when page display rows are deduplicated.
-                                matched_assignee = None
-                                for author_candidate in current_commit.get('author_candidates', []):
-                                    author_lower = author_candidate.lower()
-                                    if author_lower in assignee_lookup:
-                                        matched_assignee = assignee_lookup[author_lower]
-                                        break
-                                if matched_assignee:
-                                    recent_contributions[matched_assignee]['wiki_pages'].add(page_name)
-
-                                if page_key not in seen_pages:
-                                    seen_pages.add(page_key)
-                                    action = 'Created' if status == 'A' else 'Updated'
-                                    wiki_pages.append({
-                                        'name': page_name,
-                                        'action': action,
-                                        'date': current_commit['date'],
-                                        'author': current_commit['author'],
-                                        'message': current_commit['message']
-                                    })
+            for commit_hash, author_email, author_name, commit_date, message, status, filename in wiki_entries + retained_wiki_entries:
+                updated_wiki_entries.append([commit_hash, author_email, author_name, commit_date, message, status, filename])
+                # Convert filename to wiki page name (remove .md extension)
+                page_name = filename[:-3].replace('-', ' ')
+                page_key = (page_name, commit_date)
+                author_candidates, matched_assignee = resolved_wiki_authors[(author_email, author_name)]
+                # Track wiki contributions per assignee, even when page display rows are deduplicated.
+                if matched_assignee:
+                    recent_contributions[matched_assignee]['wiki_pages'].add(page_name)
+
+                if page_key not in seen_pages:
+                    seen_pages.add(page_key)
+                    action = 'Created' if status == 'A' else 'Updated'
+                    wiki_pages.append({
+                        'name': page_name,
+                        'action': action,
+                        'date': commit_date,
+                        'author': author_candidates[0] if author_candidates else '',
+                        'message': message
+                    })
+            wiki_log_ok = True
             
             print('Found {:,} wiki page updates in the last {:,} days'.format(len(wiki_pages), num_day))
         else:
-            print('Warning: Could not get wiki git log: {}'.format(result.stderr.decode('utf8').strip()))
+            print('Warning: Could not get wiki git log: {}'.format(log_stderr))
             
 except Exception as e:
     print('Warning: Error processing wiki updates: {}'.format(str(e)))
 
-# Add wiki updates section
-wiki_txt = '### Wiki updates (last {:,} days)\n'.format(num_day)
-if wiki_pages:
-    wiki_txt += 'The following wiki pages were created or updated:\n\n'
+if wiki_author_logins_path and wiki_author_logins != loaded_wiki_author_logins:
+    write_json_atomic(wiki_author_logins_path, {'logins': wiki_author_logins})
 
-    # Sort by date (most recent first)
-    wiki_pages_sorted = sorted(wiki_pages, key=lambda x: x['date'], reverse=True)
-    
-    for page in wiki_pages_sorted:
-        wiki_page_url = repo_web_url + '/wiki/' + page['name'].replace(' ', '-')
-        wiki_txt += '- **[{}]({})** - {} on {} by {}\n'.format(
-            page['name'], 
-            wiki_page_url,
-            page['action'],
-            page['date'],
-            page['author']
-        )
-    wiki_txt += '\n'
-else:
-    wiki_txt += 'No wiki pages were created or updated in the last {:,} days.\n\n'.format(num_day)
+if incremental_state_path:
+    state_issues = {}
+    for issue_num in recent_issue_nums:
+        updated_at = recent_issue_updated_at.get(issue_num)
+        if not updated_at or issue_num in incomplete_issue_nums:
+            continue
+        if issue_num in issue_events:
+            state_issues[str(issue_num)] = {
+                'updatedAt': updated_at,
+                'events': encode_issue_events([event for event in issue_events[issue_num] if event[0] == 'contribution'], startday),
+                'reactionTargets': [list(target) for target in reaction_targets.get(issue_num, [])],
+            }
+            continue
+        # Issues outside this run's scan keep their previous entry while it still matches the listing.
+        state_entry = incremental_state['issues'].get(str(issue_num))
+        if isinstance(state_entry, dict) and state_entry.get('updatedAt') == updated_at:
+            state_issues[str(issue_num)] = state_entry
+    if wiki_log_ok:
+        state_wiki = {'last_commit': wiki_last_commit, 'entries': updated_wiki_entries}
+    else:
+        state_wiki = {}
+    save_incremental_state(incremental_state_path, repo_slug, remove_label_normalized, state_issues, state_wiki)
 
-issue_txt = '### Issue summary\n'
-issue_txt += 'The following lists include the issues that have been inactive for more than {:,} days.\n\n'.format(since_last_updated_day)
+start_phase('rendering')
+wiki_txt = render_wiki_section(wiki_pages, num_day, repo_web_url)
 
+issue_parts = [REPORT_TEMPLATES['issue_header'].format(inactive_days=since_last_updated_day)]
 for assignee in unique_assignees:
-    assignee_key = assignee.lower()
-    assigned_issues = [
-        issue for issue in inactive_issues
-        if any(
-            isinstance(issue_assignee, str) and issue_assignee.strip().lower() == assignee_key
-            for issue_assignee in issue['assignees']
-        )
-    ]
-    assigned_issue_nums = [ issue['issue_number'] for issue in assigned_issues ]
+    assigned_issues = inactive_issues_by_assignee.get(assignee.lower(), [])
+    assigned_issue_nums = [ issue.issue_number for issue in assigned_issues ]
     print('Issues assigned to {}: {}'.format(assignee, ','.join([ str(n) for n in assigned_issue_nums ])))
-    assigned_open_issue_url = query_url(repo_web_url, 'assignee:{} is:open'.format(assignee))
-    mentioned_unassigned_open_issue_url = query_url(repo_web_url, '-assignee:{} mentions:{} is:open'.format(assignee, assignee))
     if assigned_issues:
-        issue_txt += '@{}: '.format(assignee)
-        for assigned_issue in assigned_issues:
-            inactive_day = int((current_unix_timestamp - assigned_issue['unix_timestamp_updated']) / 86400)
-            issue_txt += '{} ({} days), '.format(assigned_issue['issue_url'], inactive_day)
-        issue_txt = re.sub(', $', '\n', issue_txt)
+        issue_parts.append(REPORT_TEMPLATES['assignee_issues'].format(assignee=assignee, issues=render_issue_list(assigned_issues, current_unix_timestamp)))
     else:
-        issue_txt += '@{}: no inactive assigned issues.\n'.format(assignee)
-    assignee_report_path = 'assignee_{}.txt'.format(assignee_filename_map[assignee])
-    with open(assignee_report_path, 'w') as assignee_report:
-        for assigned_issue in assigned_issues:
-            inactive_day = int((current_unix_timestamp - assigned_issue['unix_timestamp_updated']) / 86400)
-            assignee_report.write('{},{},{}\n'.format(assigned_issue['issue_number'], assigned_issue['issue_url'], inactive_day))
-    txt = '[List of open issues where @{} is assigned]({})\n'
-    issue_txt += txt.format(assignee, assigned_open_issue_url)
-    txt = '[List of open issues where @{} is not assigned but mentioned]({})\n'
-    issue_txt += txt.format(assignee, mentioned_unassigned_open_issue_url)
-    txt = 'Thank you for your {:,} contributions on {:,} issues, writing in {:,} wiki pages, and giving {:,} reactions in the last {:,} days!\n'
-    num_wiki_pages = len(recent_contributions[assignee]['wiki_pages'])
-    issue_txt += txt.format(recent_contributions[assignee]['num_comment'], recent_contributions[assignee]['num_issue'], num_wiki_pages, recent_contributions[assignee]['reactions_given'], num_day)
+        issue_parts.append(REPORT_TEMPLATES['assignee_no_issues'].format(assignee=assignee))
+    report_outputs['assignee_{}.txt'.format(assignee_filename_map[assignee])] = ''.join([
+        '{},{},{}\n'.format(assigned_issue.issue_number, assigned_issue.issue_url, inactive_days(assigned_issue, current_unix_timestamp))
+        for assigned_issue in assigned_issues
+    ])
+    contributions = recent_contributions[assignee]
+    issue_parts.append(REPORT_TEMPLATES['assignee_assigned_link'].format(
+        assignee=assignee, url=query_url(repo_web_url, 'assignee:{} is:open'.format(assignee))))
+    issue_parts.append(REPORT_TEMPLATES['assignee_mentioned_link'].format(
+        assignee=assignee, url=query_url(repo_web_url, '-assignee:{} mentions:{} is:open'.format(assignee, assignee))))
+    issue_parts.append(REPORT_TEMPLATES['assignee_thanks'].format(
+        num_comment=contributions['num_comment'],
+        num_issue=contributions['num_issue'],
+        num_wiki_pages=len(contributions['wiki_pages']),
+        reactions_given=contributions['reactions_given'],
+        num_day=num_day,
+    ))
     #txt = 'You received {:,} reactions on your posts.\n'
     #issue_txt += txt.format(recent_contributions[assignee]['reactions_received'])
-    issue_txt += '\n'
+    issue_parts.append(REPORT_TEMPLATES['assignee_footer'])
 
 unassigned_issues = [
     issue for issue in issues
-    if (not any(issue['assignees'])) and (not has_label_case_insensitive(issue['labels'], remove_label_normalized))
+    if (not issue.assignee_keys) and (remove_label_normalized not in issue.label_keys)
 ]
 if len(unassigned_issues)==0:
-    issue_txt += 'There is no unassigned issue.\n'
+    issue_parts.append(REPORT_TEMPLATES['no_unassigned'])
 else:
-    txt = 'There are {} unassigned issues. If anyone is willing to voluntarily take care of these, it would be very helpful: '
-    issue_txt += txt.format(len(unassigned_issues))
-    for unassigned_issue in unassigned_issues:
-        inactive_day = int((current_unix_timestamp - unassigned_issue['unix_timestamp_updated']) / 86400)
-        issue_txt += '{} ({} days), '.format(unassigned_issue['issue_url'], inactive_day)
-issue_txt = re.sub(', $', '\n\n', issue_txt)
-
-with open('issue_report.txt', 'w') as f:
-    f.write(wiki_txt)
-    f.write(issue_txt)
+    issue_parts.append(REPORT_TEMPLATES['unassigned_issues'].format(
+        count=len(unassigned_issues), issues=render_issue_list(unassigned_issues, current_unix_timestamp)))
+issue_txt = ''.join(issue_parts)
+if issue_stats_path:
+    report_outputs[issue_stats_path] = issue_stats_txt
+report_outputs['issue_report.txt'] = wiki_txt + issue_txt
+
+num_written_outputs = commit_output_files(report_outputs, 'assignee_*.txt')
+print('Wrote {:,} of {:,} output files; the others were unchanged.'.format(num_written_outputs, len(report_outputs)))
+
+report_metrics = summarize_metrics(time.monotonic())
+report_metrics_path = os.environ.get('REPORT_METRICS_FILE', 'report_metrics.json').strip()
+if report_metrics_path:
+    with open(report_metrics_path, 'w') as f:
+        json.dump(report_metrics, f, indent=2)
+        f.write('\n')
+step_summary_path = os.environ.get('GITHUB_STEP_SUMMARY', '').strip()
+try:
+    write_step_summary = parse_bool(os.environ.get('REPORT_STEP_SUMMARY', 'no'))
+except ValueError as exc:
+    print('Warning: {}. Step summary is disabled.'.format(exc))
+    write_step_summary = False
+if write_step_summary and step_summary_path:
+    with open(step_summary_path, 'a') as f:
+        f.write(metrics_markdown(report_metrics))
 
 print('Ending write_issue_report.py')
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BENCH_PATH = REPO_ROOT / 'benchmarks' / 'bench_write_issue_report.py'
+
+
+class BenchWriteIssueReportTests(unittest.TestCase):
+    def test_small_synthetic_run_reports_phases_and_call_counts(self):
+        with tempfile.TemporaryDirectory(prefix='bench_write_issue_report_test.') as tmpdir:
+            output_path = Path(tmpdir) / 'bench.json'
+            result = subprocess.run(
+                [
+                    sys.executable, str(BENCH_PATH),
+                    '--open-issues', '50', '--recent-issues', '3', '--comments', '2', '--reactions', '1',
+                    '--wiki-commits', '4', '--repeat', '1', '--output', str(output_path),
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(result.returncode, 0, result.stdout)
+            results = json.loads(output_path.read_text(encoding='utf-8'))
+        summary = results['summary']
+        self.assertEqual(set(summary['phases_sec']), {'ingest', 'issue_scan', 'reaction_lookups', 'wiki_log', 'rendering'})
+        # 1 listing + 1 GraphQL batch; reactions come inline with the batch, so none are looked up
+        self.assertEqual(summary['gh_calls'], 2)
+        self.assertGreater(summary['peak_rss_kb'], 0)
+        self.assertEqual(results['params']['open_issues'], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 import datetime
+import http.server
 import json
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 
@@ -14,9 +18,22 @@ FIXED_TEST_NOW = datetime.datetime(2026, 2, 10, 12, 0, 0)
 FIXED_TEST_NOW_ISO = FIXED_TEST_NOW.strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
+# `git log -z --name-status` output in the script's wiki log format for
+# (hash, author email, author name, date, subject, [(status, path, ...), ...]) commits.
+def wiki_log_z(*commits):
+    records = []
+    for commit_hash, author_email, author_name, commit_date, subject, changes in commits:
+        record = '\x01' + '\x00'.join((commit_hash, author_email, author_name, commit_date, subject))
+        if changes:
+            record += '\n' + ''.join(field + '\x00' for change in changes for field in change)
+        records.append(record)
+    return '\x00'.join(records).encode('utf-8')
+
+
 GH_STUB = """#!/usr/bin/env python3
 import json
 import os
+import re
 import sys
 
 args = sys.argv[1:]
@@ -32,6 +49,16 @@ if os.environ.get('GH_FAIL_ALL') == '1':
 if len(args) >= 2 and args[0] == 'issue' and args[1] == 'list':
     exit_code = int(os.environ.get('GH_ISSUE_LIST_EXIT', '0'))
     output = os.environ.get('GH_ISSUE_LIST_OUTPUT', '')
+    if 'GH_ISSUE_LIST_UPDATED_JSON' in os.environ:
+        # [[number, updatedAt], ...] filtered by the updated: search range and --limit, newest first like gh
+        lower, upper = re.search(r'updated:(\\S+)\\.\\.(\\S+)', args[args.index('--search') + 1]).groups()
+        lower = lower + 'T00:00:00Z' if len(lower) == 10 else lower
+        upper = upper + 'T23:59:59Z' if len(upper) == 10 else upper
+        matches = sorted(
+            (item for item in json.loads(os.environ['GH_ISSUE_LIST_UPDATED_JSON']) if lower <= item[1] <= upper),
+            key=lambda item: item[1], reverse=True,
+        )
+        output = ''.join('{}\\t{}\\n'.format(number, updated_at) for number, updated_at in matches[:int(args[args.index('--limit') + 1])])
     if output:
         sys.stdout.write(output)
         if not output.endswith('\\n'):
@@ -57,6 +84,29 @@ if len(args) >= 3 and args[0] == 'issue' and args[1] == 'view':
     sys.stderr.write('missing issue view for {}\\n'.format(key))
     sys.exit(1)
 
+def graphql_operation(call_args):
+    for index, arg in enumerate(call_args[:-1]):
+        if arg == '-f' and call_args[index + 1].startswith('query='):
+            match = re.search(r'\\bquery\\s+(\\w+)', call_args[index + 1])
+            if match:
+                return match.group(1)
+    return ''
+
+if len(args) >= 2 and args[0] == 'api' and args[1] == 'graphql' and 'GH_GRAPHQL_RESPONSES_JSON' in os.environ:
+    # Responses are queued per operation name and served in call order.
+    operation = graphql_operation(args)
+    queue = json.loads(os.environ['GH_GRAPHQL_RESPONSES_JSON']).get(operation, [])
+    call_index = 0
+    if log_path:
+        with open(log_path, encoding='utf-8') as fh:
+            logged = [json.loads(line) for line in fh if line.strip()]
+        call_index = sum(1 for call in logged if call[:2] == ['api', 'graphql'] and graphql_operation(call) == operation) - 1
+    if 0 <= call_index < len(queue):
+        sys.stdout.write(json.dumps(queue[call_index]) + '\\n')
+        sys.exit(0)
+    sys.stderr.write('missing graphql response for {}\\n'.format(operation))
+    sys.exit(1)
+
 if len(args) >= 2 and args[0] == 'api':
     endpoint = args[1]
     responses_json = os.environ.get('GH_API_RESPONSES_JSON', '{}')
@@ -64,6 +114,32 @@ if len(args) >= 2 and args[0] == 'api':
         responses = json.loads(responses_json)
     except Exception:
         responses = {}
+    include_headers = '-i' in args
+    # GH_API_RATE_LIMITED_JSON maps an endpoint to how many of its first calls answer 429.
+    rate_limited_calls = json.loads(os.environ.get('GH_API_RATE_LIMITED_JSON', '{}')).get(endpoint, 0)
+    if rate_limited_calls and log_path:
+        with open(log_path, encoding='utf-8') as fh:
+            previous_calls = sum(1 for line in fh if line.strip() and json.loads(line)[:2] == ['api', endpoint]) - 1
+        if previous_calls < rate_limited_calls:
+            sys.stdout.write('HTTP/2.0 429 Too Many Requests\\r\\nRetry-After: 0\\r\\n\\r\\n')
+            sys.stderr.write('gh: HTTP 429\\n')
+            sys.exit(1)
+    etag = json.loads(os.environ.get('GH_API_ETAGS_JSON', '{}')).get(endpoint)
+    if_none_match = None
+    for index, arg in enumerate(args[:-1]):
+        if arg == '-H' and args[index + 1].lower().startswith('if-none-match:'):
+            if_none_match = args[index + 1].split(':', 1)[1].strip()
+    if include_headers and etag and if_none_match == etag:
+        sys.stdout.write('HTTP/2.0 304 Not Modified\\r\\nEtag: {}\\r\\n\\r\\n'.format(etag))
+        sys.stderr.write('gh: HTTP 304\\n')
+        sys.exit(1)
+    if endpoint in responses and include_headers:
+        sys.stdout.write('HTTP/2.0 200 OK\\r\\n')
+        if etag:
+            sys.stdout.write('Etag: {}\\r\\n'.format(etag))
+        if 'GH_API_RATE_LIMIT_REMAINING' in os.environ:
+            sys.stdout.write('X-Ratelimit-Remaining: {}\\r\\nX-Ratelimit-Reset: 4102444800\\r\\n'.format(os.environ['GH_API_RATE_LIMIT_REMAINING']))
+        sys.stdout.write('\\r\\n')
     if endpoint in responses:
         value = responses[endpoint]
         if isinstance(value, list):
@@ -125,9 +201,9 @@ if len(args) >= 5 and args[0] == '-C' and args[2] == 'remote' and args[3] == 'se
 
 if len(args) >= 3 and args[0] == '-C' and args[2] == 'log':
     exit_code = int_env('GIT_LOG_EXIT', 1)
-    out = os.environ.get('GIT_LOG_OUTPUT', '')
-    if out:
-        sys.stdout.write(out)
+    if os.environ.get('GIT_LOG_OUTPUT_FILE'):
+        with open(os.environ['GIT_LOG_OUTPUT_FILE'], 'rb') as fh:
+            sys.stdout.buffer.write(fh.read())
     if exit_code != 0:
         sys.stderr.write(os.environ.get('GIT_LOG_ERROR', 'log failed'))
     sys.exit(exit_code)
@@ -196,6 +272,11 @@ class WriteIssueReportTests(unittest.TestCase):
     def _read_text(self, relative_path):
         return (self.work / relative_path).read_text(encoding='utf-8')
 
+    def _write_git_log(self, output):
+        path = self.work / 'git_log_output'
+        path.write_bytes(output)
+        return str(path)
+
     def _read_call_log(self, relative_path):
         path = self.work / relative_path
         if not path.exists():
@@ -381,6 +462,26 @@ class WriteIssueReportTests(unittest.TestCase):
         self.assertIn('https://github.com/example/repo/issues/1', report)
         self.assertIn('https://github.com/example/repo/issues/2', report)
 
+    def test_assignee_issue_lists_keep_listing_order_without_duplicates(self):
+        assignee_sets = {5: ['bob', 'alice'], 3: ['Alice', 'alice'], 9: ['bob'], 4: ['alice']}
+        issues = [
+            {
+                'number': number,
+                'assignees': [{'login': login} for login in logins],
+                'updatedAt': '2026-01-01T00:00:00Z',
+                'url': 'https://github.com/example/repo/issues/{}'.format(number),
+                'title': 'x',
+                'labels': [],
+            }
+            for number, logins in assignee_sets.items()
+        ]
+        result = self._run_script(json.dumps(issues), issue_hyperlink='yes', extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+        self.assertEqual(result.returncode, 0)
+        alice_rows = [line.split(',')[0] for line in self._read_text('assignee_alice.txt').splitlines()]
+        bob_rows = [line.split(',')[0] for line in self._read_text('assignee_bob.txt').splitlines()]
+        self.assertEqual(alice_rows, ['5', '3', '4'])
+        self.assertEqual(bob_rows, ['5', '9'])
+
     def test_legacy_input_is_still_supported(self):
         legacy = '\n'.join([
             '1',
@@ -493,6 +594,33 @@ class WriteIssueReportTests(unittest.TestCase):
         gh_calls = self._read_call_log('gh_calls.log')
         self.assertFalse(any(call[:2] == ['issue', 'view'] for call in gh_calls))
 
+    def test_recent_issue_search_is_split_by_day_and_bisected_past_the_result_cap(self):
+        issues = [{
+            'number': 1,
+            'assignees': [],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        # 1,100 updates on one day alone exceed the cap, so that day is halved after the per-day split.
+        updated = [[number, '2026-02-09T{:02d}:{:02d}:00Z'.format(number % 24, number % 60)] for number in range(1, 1101)]
+        updated += [[number, '2026-02-0{}T08:00:00Z'.format(3 + number % 5)] for number in range(1101, 1501)]
+        result = self._run_script(json.dumps(issues), extra_env={'GH_ISSUE_LIST_UPDATED_JSON': json.dumps(updated)})
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertNotIn('reached the search limit', result.stdout)
+        listed_line = next(line for line in result.stdout.splitlines() if line.startswith('Issues updated in the last 7 days:'))
+        listed = [int(number) for number in listed_line.split(':', 1)[1].split(',')]
+        self.assertEqual(sorted(listed), list(range(1, 1501)))
+        searches = [call[call.index('--search') + 1] for call in self._read_call_log('gh_calls.log') if call[:2] == ['issue', 'list']]
+        self.assertEqual(searches[0], 'updated:2026-02-03..2026-02-10')
+        self.assertIn('updated:2026-02-09..2026-02-09', searches)
+        self.assertIn('updated:2026-02-09T00:00:00Z..2026-02-09T11:59:59Z', searches)
+        self.assertIn('updated:2026-02-09T12:00:00Z..2026-02-09T23:59:59Z', searches)
+        # Each search's command is printed whole and once, from the merge loop rather than the workers.
+        printed = [line for line in result.stdout.splitlines() if line.startswith('gh command: gh issue list ')]
+        self.assertEqual(sorted(line.split('--search ', 1)[1].split(' ', 1)[0] for line in printed), sorted(searches))
+
     def test_comment_reaction_lookup_limit_is_enforced(self):
         issues = [{
             'number': 1,
@@ -548,6 +676,64 @@ class WriteIssueReportTests(unittest.TestCase):
         self.assertEqual(result.returncode, 0)
         self.assertTrue((self.work / 'assignee_bad_name.txt').exists())
 
+    def test_unchanged_outputs_are_kept_and_stale_assignee_files_removed(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        result = self._run_script(json.dumps(issues), extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+        self.assertEqual(result.returncode, 0)
+        alice_path = self.work / 'assignee_alice.txt'
+        os.utime(alice_path, ns=(1, 1))
+        (self.work / 'assignee_zed.txt').write_text('9,#<span/>9,1\n', encoding='utf-8')
+
+        result = self._run_script(json.dumps(issues), extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(alice_path.stat().st_mtime_ns, 1)
+        self.assertEqual(self._read_text('assignee_alice.txt'), '1,#<span/>1,40\n')
+        self.assertFalse((self.work / 'assignee_zed.txt').exists())
+        self.assertEqual(list(self.work.glob('.report_output.*')), [])
+
+    def test_issue_stats_file_uses_graphql_total_counts_with_search_fallback(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        stats_response = {'data': {'repository': {'open': {'totalCount': 12}, 'closed': {'totalCount': 34567}}}}
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_EXIT': '1',
+                'ISSUE_STATS_FILE': 'issue_stats.env',
+                'GH_GRAPHQL_RESPONSES_JSON': json.dumps({'IssueStats': [stats_response]}),
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(self._read_text('issue_stats.env'), 'NUM_OPEN_ISSUE=12\nNUM_CLOSE_ISSUE=34567\n')
+        stats_calls = [call for call in self._read_call_log('gh_calls.log') if call[:2] == ['api', 'graphql'] or call[1].startswith('search/')]
+        self.assertEqual(len(stats_calls), 1)
+        (self.work / 'gh_calls.log').unlink()
+
+        search_endpoint = 'search/issues?q=repo%3Aexample%2Frepo%20is%3Aissue%20is%3A{}&per_page=1'
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_EXIT': '1',
+                'ISSUE_STATS_FILE': 'issue_stats.env',
+                'GH_API_RESPONSES_JSON': json.dumps({search_endpoint.format('open'): '5', search_endpoint.format('closed'): '7'}),
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(self._read_text('issue_stats.env'), 'NUM_OPEN_ISSUE=5\nNUM_CLOSE_ISSUE=7\n')
+
     def test_assignee_report_filename_collision_is_disambiguated(self):
         issues = [
             {
@@ -772,14 +958,14 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = 'abc123|alice@users.noreply.github.com|2026-02-09|update A|B\nM\tMy-Page.md\n'
+        git_log_output = wiki_log_z(('abc123', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'update A|B', [('M', 'My-Page.md')]))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -796,14 +982,14 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa|alice@users.noreply.github.com|2026-02-09|update\tA\nM\tTab-Page.md\n'
+        git_log_output = wiki_log_z(('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'update\tA', [('M', 'Tab-Page.md')]))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -811,6 +997,127 @@ class WriteIssueReportTests(unittest.TestCase):
         self.assertIn('**[Tab Page](', report)
         self.assertIn('by alice', report)
 
+    def test_nul_terminated_wiki_log_keeps_raw_paths_and_rename_targets(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        log_path = self.work / 'git_log_fixture.txt'
+        log_path.write_bytes(
+            b'\x01bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb\x00alice@users.noreply.github.com\x00alice\x002026-02-09\x00rename\n'
+            b'R100\x00Old-Page.md\x00New-Page.md\x00D\x00Gone.md\x00\x00'
+            b'\x01cccccccccccccccccccccccccccccccccccccccc\x00bob@example.com\x00bob\x002026-02-08\x00empty\x00'
+            b'\x01aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa\x00alice@users.noreply.github.com\x00alice\x002026-02-08\x00add\n'
+            + 'A\x00Ünï\tPage.md\x00'.encode('utf-8')
+        )
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_EXIT': '1',
+                'GIT_CLONE_EXIT': '0',
+                'GIT_LOG_EXIT': '0',
+                'GIT_LOG_OUTPUT_FILE': str(log_path),
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        report = self._read_text('issue_report.txt')
+        self.assertIn('**[New Page](', report)
+        self.assertIn('Updated on 2026-02-09 by alice', report)
+        self.assertIn('**[Ünï\tPage](', report)
+        self.assertIn('Created on 2026-02-08 by alice', report)
+        self.assertNotIn('Old Page', report)
+        self.assertNotIn('Gone', report)
+        self.assertIn('writing in 2 wiki pages', report)
+        log_calls = [call for call in self._read_call_log('git_calls.log') if call[2:3] == ['log']]
+        self.assertIn('-z', log_calls[0])
+        self.assertIn('--pretty=format:%x01%H%x00%ae%x00%an%x00%ad%x00%s', log_calls[0])
+
+    def test_wiki_author_email_learned_from_matching_name_is_reused_across_runs(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+
+        def run(author_name):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_EXIT': '1',
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'GIT_CLONE_EXIT': '0',
+                    'GIT_LOG_EXIT': '0',
+                    'GIT_LOG_OUTPUT_FILE': self._write_git_log(wiki_log_z(('abc123', 'a.smith@corp.example', author_name, '2026-02-09', 'edit', [('M', 'My-Page.md')]))),
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            return self._read_text('issue_report.txt')
+
+        self.assertIn('writing in 1 wiki pages', run('Alice'))
+        learned = json.loads((self.work / 'cache' / 'wiki_authors.json').read_text(encoding='utf-8'))
+        self.assertEqual(learned, {'logins': {'a.smith@corp.example': 'alice'}})
+        # Neither the new display name nor the address names the login; the learned email still does.
+        self.assertIn('writing in 1 wiki pages', run('Alice Smith'))
+
+    def test_large_json_array_is_streamed_across_chunks(self):
+        issues = [
+            {
+                'number': number,
+                'assignees': [{'login': 'alice'}],
+                'updatedAt': '2026-01-01T00:00:00Z',
+                'url': 'https://github.com/example/repo/issues/{}'.format(number),
+                'title': 'Issue with a long title {}'.format('x' * 50),
+                'labels': [],
+            }
+            for number in range(1, 2001)
+        ]
+        # Bare numbers and whitespace land on chunk boundaries somewhere in a listing this size.
+        input_text = '\ufeff  [\n' + ',\n'.join([json.dumps(issue) for issue in issues] + ['7', '  12345  ']) + '\n]\n'
+        self.assertGreater(len(input_text), 4 * (1 << 16))
+        result = self._run_script(input_text, extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('Number of open Issues: 2,000', result.stdout)
+        self.assertIn('Skipping malformed issue JSON row index 2001', result.stdout)
+        self.assertIn('#<span/>2000 (40 days)', self._read_text('issue_report.txt'))
+
+        truncated = self._run_script(input_text.rstrip()[:-1].rstrip()[:-20])
+        self.assertNotEqual(truncated.returncode, 0)
+        self.assertIn('Failed to parse issue JSON', truncated.stdout)
+
+    def test_ndjson_input_skips_malformed_and_truncated_lines(self):
+        rows = [
+            json.dumps({'number': number, 'assignees': [{'login': 'alice'}], 'updatedAt': '2026-01-01T00:00:00Z', 'labels': []})
+            for number in (1, 2, 3)
+        ]
+        # Line 3 is not JSON and the last line was cut short when the listing was interrupted.
+        ndjson = '\n'.join([rows[0], rows[1], 'not json', '', rows[2], rows[2][:20]]) + '\n'
+        for input_name in ('gh_out.ndjson', 'gh_out.json'):
+            result = self._run_script(ndjson, input_name=input_name, extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+            self.assertEqual(result.returncode, 0)
+            self.assertIn('Number of open Issues: 3', result.stdout)
+            self.assertIn('Skipping malformed issue JSON line 3', result.stdout)
+            self.assertIn('Skipping malformed issue JSON line 6', result.stdout)
+            self.assertIn('#<span/>3 (40 days)', self._read_text('issue_report.txt'))
+
+    def test_json_array_in_ndjson_named_file_is_read_as_array(self):
+        issues = [
+            {'number': number, 'assignees': [{'login': 'alice'}], 'updatedAt': '2026-01-01T00:00:00Z', 'labels': []}
+            for number in (1, 2)
+        ]
+        for input_name in ('gh_out.ndjson', 'gh_out.jsonl'):
+            for input_text in (json.dumps(issues), json.dumps(issues, indent=2)):
+                result = self._run_script(input_text, input_name=input_name, extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+                self.assertEqual(result.returncode, 0, result.stdout)
+                self.assertIn('Number of open Issues: 2', result.stdout)
+                self.assertNotIn('Skipping malformed issue JSON line', result.stdout)
+
     def test_json_input_requires_array_root(self):
         result = self._run_script('{"number": 1}', input_name='gh_out.json')
         self.assertNotEqual(result.returncode, 0)
@@ -942,7 +1249,7 @@ class WriteIssueReportTests(unittest.TestCase):
         )
         self.assertEqual(result.returncode, 0)
         gh_calls = self._read_call_log('gh_calls.log')
-        api_calls = [call for call in gh_calls if len(call) >= 2 and call[0] == 'api']
+        api_calls = [call for call in gh_calls if len(call) >= 2 and call[0] == 'api' and call[1] != 'graphql']
         self.assertEqual(api_calls, [])
 
     def test_weekly_forum_labeled_issue_is_excluded_from_reaction_scan(self):
@@ -1400,14 +1707,14 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = 'abc123|alice@users.noreply.github.com|2026-02-09|wiki\nM\tLab-Notes.md\n'
+        git_log_output = wiki_log_z(('abc123', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'wiki', [('M', 'Lab-Notes.md')]))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -1423,11 +1730,9 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = (
-            'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa|alice@users.noreply.github.com|2026-02-09|alice edit\n'
-            'M\tShared-Page.md\n'
-            'bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb|bob@users.noreply.github.com|2026-02-09|bob edit\n'
-            'M\tShared-Page.md\n'
+        git_log_output = wiki_log_z(
+            ('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'alice edit', [('M', 'Shared-Page.md')]),
+            ('bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb', 'bob@users.noreply.github.com', 'bob', '2026-02-09', 'bob edit', [('M', 'Shared-Page.md')]),
         )
         result = self._run_script(
             json.dumps(issues),
@@ -1435,7 +1740,7 @@ class WriteIssueReportTests(unittest.TestCase):
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -1445,7 +1750,7 @@ class WriteIssueReportTests(unittest.TestCase):
         self.assertEqual(report.count('**[Shared Page]('), 1)
         self.assertEqual(report.count('writing in 1 wiki pages'), 2)
 
-    def test_wiki_quoted_non_ascii_path_and_author_name_are_counted(self):
+    def test_wiki_non_ascii_path_and_author_name_are_counted(self):
         issues = [{
             'number': 1,
             'assignees': [{'login': 'SayokoShirai'}],
@@ -1454,17 +1759,21 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = (
-            'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa|sayoko.124@gmail.com|SayokoShirai|2026-03-05|Updated 毒劇物及びリスクアセスメント対象試薬のCRIS登録と保管・管理 (markdown)\n'
-            'M\t"\\346\\257\\222\\345\\212\\207\\347\\211\\251\\345\\217\\212\\343\\201\\263\\343\\203\\252\\343\\202\\271\\343\\202\\257\\343\\202\\242\\343\\202\\273\\343\\202\\271\\343\\203\\241\\343\\203\\263\\343\\203\\210\\345\\257\\276\\350\\261\\241\\350\\251\\246\\350\\226\\254\\343\\201\\256CRIS\\347\\231\\273\\351\\214\\262\\343\\201\\250\\344\\277\\235\\347\\256\\241\\343\\203\\273\\347\\256\\241\\347\\220\\206.md"\n'
-        )
+        git_log_output = wiki_log_z((
+            'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa',
+            'sayoko.124@gmail.com',
+            'SayokoShirai',
+            '2026-03-05',
+            'Updated 毒劇物及びリスクアセスメント対象試薬のCRIS登録と保管・管理 (markdown)',
+            [('M', '毒劇物及びリスクアセスメント対象試薬のCRIS登録と保管・管理.md')],
+        ))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -1699,17 +2008,14 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = (
-            'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa|alice@users.noreply.github.com|2026-02-09|rename\n'
-            'R100\tOld-Page.md\tNew-Page.md\n'
-        )
+        git_log_output = wiki_log_z(('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'rename', [('R100', 'Old-Page.md', 'New-Page.md')]))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -1727,17 +2033,14 @@ class WriteIssueReportTests(unittest.TestCase):
             'title': 'x',
             'labels': [],
         }]
-        git_log_output = (
-            'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa|alice@users.noreply.github.com|2026-02-09|copy\n'
-            'C100\tOld-Page.md\tCopied-Page.md\n'
-        )
+        git_log_output = wiki_log_z(('aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'copy', [('C100', 'Old-Page.md', 'Copied-Page.md')]))
         result = self._run_script(
             json.dumps(issues),
             extra_env={
                 'GH_ISSUE_LIST_EXIT': '1',
                 'GIT_CLONE_EXIT': '0',
                 'GIT_LOG_EXIT': '0',
-                'GIT_LOG_OUTPUT': git_log_output,
+                'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
             },
         )
         self.assertEqual(result.returncode, 0)
@@ -1746,6 +2049,1051 @@ class WriteIssueReportTests(unittest.TestCase):
         self.assertIn('Updated on 2026-02-09 by alice', report)
         self.assertIn('writing in 1 wiki pages', report)
 
+    def test_graphql_batch_replaces_issue_view_calls(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'labels': {'nodes': [{'name': 'bug'}]},
+            'reactionGroups': [],
+            'comments': {
+                'pageInfo': {'hasNextPage': True, 'endCursor': 'cursor1'},
+                'nodes': [
+                    {'databaseId': 11, 'createdAt': '2026-02-09T01:00:00Z', 'author': {'login': 'alice'}, 'reactionGroups': []},
+                ],
+            },
+        }
+        comment_page = {
+            'pageInfo': {'hasNextPage': False, 'endCursor': None},
+            'nodes': [
+                {'databaseId': 12, 'createdAt': '2026-02-09T02:00:00Z', 'author': {'login': 'alice'}, 'reactionGroups': []},
+            ],
+        }
+        graphql_responses = {
+            'IssueBatch': [{'data': {'repository': {'i1': issue_node, 'i2': None}}}],
+            'IssueComments': [{'data': {'repository': {'issue': {'comments': comment_page}}}}],
+        }
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [],
+        }
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n2\n',
+                'GH_GRAPHQL_RESPONSES_JSON': json.dumps(graphql_responses),
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'2': issue_view}),
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        gh_calls = self._read_call_log('gh_calls.log')
+        graphql_calls = [call for call in gh_calls if call[:2] == ['api', 'graphql']]
+        self.assertEqual(len(graphql_calls), 2)
+        self.assertIn('cursor=cursor1', graphql_calls[1])
+        issue_view_calls = [call[2] for call in gh_calls if call[:2] == ['issue', 'view']]
+        self.assertEqual(issue_view_calls, ['2'])
+        report = self._read_text('issue_report.txt')
+        self.assertIn('Thank you for your 4 contributions on 2 issues', report)
+
+    def test_http_transport_serves_gh_api_calls_over_one_kept_alive_connection(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-01T00:00:00Z',
+            'author': {'login': 'bob'},
+            'labels': {'nodes': []},
+            'reactionGroups': [{'content': 'THUMBS_UP', 'users': {'totalCount': 2}}],
+            'comments': {'pageInfo': {'hasNextPage': False, 'endCursor': None}, 'nodes': []},
+        }
+        requests = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, value, extra_headers=()):
+                body = json.dumps(value).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, header_value in extra_headers:
+                    self.send_header(name, header_value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                self.server.last_variables = body['variables']
+                requests.append((self.client_address, 'POST', self.path, self.headers['Authorization']))
+                self._send_json({'data': {'repository': {'i1': issue_node}}})
+
+            def do_GET(self):
+                requests.append((self.client_address, 'GET', self.path, self.headers['Authorization']))
+                base = 'http://127.0.0.1:{}/repos/example/repo/issues/1/reactions'.format(self.server.server_port)
+                if self.path.endswith('?page=2'):
+                    self._send_json([{'created_at': '2026-02-09T04:00:00Z', 'user': {'login': 'alice'}}])
+                else:
+                    self._send_json(
+                        [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}],
+                        extra_headers=[('Link', '<{}?page=2>; rel="next", <{}?page=2>; rel="last"'.format(base, base))],
+                    )
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'GITHUB_API_TRANSPORT': 'http',
+                'GITHUB_API_URL': 'http://127.0.0.1:{}'.format(server.server_port),
+                'GITHUB_GRAPHQL_URL': '',
+                'GITHUB_TOKEN': 'test-token',
+                'GH_MAX_CONCURRENCY': '1',
+            },
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertEqual(
+            [(method, path) for _, method, path, _ in requests],
+            [('POST', '/graphql'), ('GET', '/repos/example/repo/issues/1/reactions'), ('GET', '/repos/example/repo/issues/1/reactions?page=2')],
+        )
+        self.assertEqual({authorization for _, _, _, authorization in requests}, {'Bearer test-token'})
+        self.assertEqual(server.last_variables, {'owner': 'example', 'name': 'repo'})
+        self.assertEqual(len({client_address for client_address, _, _, _ in requests}), 1)
+        # Only the issue listing still runs gh.
+        self.assertEqual([call[:2] for call in self._read_call_log('gh_calls.log')], [['issue', 'list']])
+        self.assertIn('giving 2 reactions', self._read_text('issue_report.txt'))
+
+    def _run_with_exhausted_graphql_budget(self, reset_delay, extra_env=None):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-01T00:00:00Z',
+            'author': {'login': 'bob'},
+            'labels': {'nodes': []},
+            'reactionGroups': [],
+            'reactions': {'pageInfo': {'hasNextPage': False}, 'nodes': []},
+            'comments': {
+                'pageInfo': {'hasNextPage': False, 'endCursor': None},
+                'nodes': [{
+                    'databaseId': 11,
+                    'createdAt': '2026-02-01T01:00:00Z',
+                    'author': {'login': 'bob'},
+                    'reactionGroups': [{'content': 'THUMBS_UP', 'users': {'totalCount': 1}}],
+                    'reactions': {'pageInfo': {'hasNextPage': True}, 'nodes': []},
+                }],
+            },
+        }
+        requests = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, value, extra_headers=()):
+                body = json.dumps(value).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, header_value in extra_headers:
+                    self.send_header(name, header_value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                requests.append(('POST', self.path))
+                # The GraphQL budget is spent; the core budget used by REST lookups is untouched.
+                self._send_json({'data': {'repository': {'i1': issue_node}}}, extra_headers=[
+                    ('x-ratelimit-resource', 'graphql'),
+                    ('x-ratelimit-remaining', '0'),
+                    ('x-ratelimit-reset', str(int(time.time() + reset_delay))),
+                ])
+
+            def do_GET(self):
+                requests.append(('GET', self.path))
+                self._send_json([{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}], extra_headers=[
+                    ('x-ratelimit-resource', 'core'),
+                    ('x-ratelimit-remaining', '4999'),
+                ])
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        env = {
+            'GH_ISSUE_LIST_OUTPUT': '1\n',
+            'GITHUB_API_TRANSPORT': 'http',
+            'GITHUB_API_URL': 'http://127.0.0.1:{}'.format(server.server_port),
+            'GITHUB_GRAPHQL_URL': '',
+            'GITHUB_TOKEN': 'test-token',
+        }
+        env.update(extra_env or {})
+        result = self._run_script(json.dumps(issues), extra_env=env)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        return result, requests
+
+    def test_exhausted_graphql_budget_does_not_skip_rest_comment_lookups(self):
+        result, requests = self._run_with_exhausted_graphql_budget(reset_delay=3600)
+        self.assertEqual(requests, [('POST', '/graphql'), ('GET', '/repos/example/repo/issues/comments/11/reactions')])
+        self.assertNotIn('skipped to keep the last', result.stdout)
+        self.assertIn('giving 1 reactions', self._read_text('issue_report.txt'))
+
+    def test_exhausted_graphql_budget_does_not_pause_rest_calls(self):
+        started = time.monotonic()
+        result, requests = self._run_with_exhausted_graphql_budget(reset_delay=30, extra_env={'GH_RETRY_MAX_DELAY_SEC': '120'})
+        self.assertLess(time.monotonic() - started, 20)
+        self.assertEqual(requests, [('POST', '/graphql'), ('GET', '/repos/example/repo/issues/comments/11/reactions')])
+        self.assertIn('giving 1 reactions', self._read_text('issue_report.txt'))
+
+    def test_comment_source_lists_repository_comments_once_instead_of_fetching_issues(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        listing = [
+            {'number': 1, 'updatedAt': '2026-02-09T05:00:00Z', 'createdAt': '2026-02-09T00:00:00Z', 'author': {'login': 'alice'}, 'labels': [], 'reactionGroups': []},
+            {'number': 2, 'updatedAt': '2026-02-09T06:00:00Z', 'createdAt': '2025-12-01T00:00:00Z', 'author': {'login': 'bob'}, 'labels': [{'name': 'weekly_forum'}], 'reactionGroups': []},
+        ]
+        comments = [
+            {'id': 11, 'issue_url': 'https://api.github.com/repos/example/repo/issues/1', 'created_at': '2026-02-09T01:00:00Z', 'user': {'login': 'alice'}, 'reactions': {'total_count': 0}},
+            {'id': 12, 'issue_url': 'https://api.github.com/repos/example/repo/issues/1', 'created_at': '2026-02-09T02:00:00Z', 'user': {'login': 'bob'}, 'reactions': {'total_count': 1, '+1': 1}},
+            {'id': 21, 'issue_url': 'https://api.github.com/repos/example/repo/issues/2', 'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}, 'reactions': {'total_count': 0}},
+            {'id': 31, 'issue_url': 'https://api.github.com/repos/example/repo/issues/3', 'created_at': '2026-02-09T04:00:00Z', 'user': {'login': 'alice'}, 'reactions': {'total_count': 0}},
+        ]
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'ISSUE_CONTRIBUTION_SOURCE': 'comments',
+                'GH_ISSUE_LIST_OUTPUT': '\n'.join(json.dumps(item) for item in listing),
+                'GH_API_RESPONSES_JSON': json.dumps({
+                    'repos/example/repo/issues/comments?since=2026-02-03T12:00:00Z&per_page=100': comments,
+                    'repos/example/repo/issues/comments/12/reactions': [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}],
+                }),
+            },
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        gh_calls = self._read_call_log('gh_calls.log')
+        self.assertFalse(any(call[:2] in (['issue', 'view'], ['api', 'graphql']) for call in gh_calls))
+        self.assertIn('number,updatedAt,createdAt,author,labels,reactionGroups', gh_calls[0])
+        # Issue 1 and comment 11 count; issue 2 carries the report label and issue 3 was not listed.
+        self.assertIn('Thank you for your 2 contributions on 1 issues, writing in 0 wiki pages, and giving 1 reactions', self._read_text('issue_report.txt'))
+
+    def test_inline_graphql_reactions_replace_rest_lookups_except_overflow(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        thumbs_up = [{'content': 'THUMBS_UP', 'users': {'totalCount': 1}}]
+
+        def reactions(logins, has_next_page=False):
+            return {
+                'pageInfo': {'hasNextPage': has_next_page},
+                'nodes': [{'createdAt': '2026-02-09T03:00:00Z', 'user': {'login': login}} for login in logins],
+            }
+
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-01T00:00:00Z',
+            'author': {'login': 'bob'},
+            'labels': {'nodes': []},
+            'reactionGroups': thumbs_up,
+            'reactions': reactions(['alice', 'carol']),
+            'comments': {
+                'pageInfo': {'hasNextPage': False, 'endCursor': None},
+                'nodes': [
+                    {'databaseId': 11, 'createdAt': '2026-02-01T01:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': thumbs_up, 'reactions': reactions(['alice'])},
+                    {'databaseId': 12, 'createdAt': '2026-02-01T02:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': thumbs_up, 'reactions': reactions(['carol'])},
+                    {'databaseId': 13, 'createdAt': '2026-02-01T03:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': thumbs_up, 'reactions': reactions(['carol'], has_next_page=True)},
+                ],
+            },
+        }
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'GH_GRAPHQL_RESPONSES_JSON': json.dumps({'IssueBatch': [{'data': {'repository': {'i1': issue_node}}}]}),
+                'GH_API_RESPONSES_JSON': json.dumps({
+                    'repos/example/repo/issues/comments/13/reactions': [{'created_at': '2026-02-09T04:00:00Z', 'user': {'login': 'alice'}}],
+                }),
+                'MAX_COMMENT_REACTION_LOOKUPS': '1',
+            },
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        api_calls = [call[1] for call in self._read_call_log('gh_calls.log') if call[0] == 'api' and call[1] != 'graphql']
+        # Only the comment with more reactions than the inline page is looked up, and the cap is not reached.
+        self.assertEqual(api_calls, ['repos/example/repo/issues/comments/13/reactions'])
+        self.assertNotIn('Reached comment reaction lookup limit', result.stdout)
+        self.assertIn('giving 3 reactions', self._read_text('issue_report.txt'))
+
+    def test_cached_issue_reactions_are_refreshed_in_one_graphql_batch(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        thumbs_up = [{'content': 'THUMBS_UP', 'users': {'totalCount': 1}}]
+
+        def reactions(logins):
+            return {
+                'pageInfo': {'hasNextPage': False},
+                'nodes': [{'createdAt': '2026-02-09T03:00:00Z', 'user': {'login': login}} for login in logins],
+            }
+
+        comment_ids = (11, 12, 13)
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-01T00:00:00Z',
+            'author': {'login': 'bob'},
+            'labels': {'nodes': []},
+            'reactionGroups': [],
+            'reactions': reactions([]),
+            'comments': {
+                'pageInfo': {'hasNextPage': False, 'endCursor': None},
+                'nodes': [
+                    {'databaseId': comment_id, 'createdAt': '2026-02-01T01:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': thumbs_up, 'reactions': reactions(['alice'])}
+                    for comment_id in comment_ids
+                ],
+            },
+        }
+        # Since the first run, alice also reacted to the issue; updatedAt does not change.
+        reaction_node = {
+            'reactions': reactions(['alice']),
+            'comments': {'nodes': [{'databaseId': comment_id, 'reactions': reactions(['alice'])} for comment_id in comment_ids]},
+        }
+
+        def run():
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '1\t2026-02-09T05:00:00Z\n',
+                    'GH_GRAPHQL_RESPONSES_JSON': json.dumps({
+                        'IssueBatch': [{'data': {'repository': {'i1': issue_node}}}],
+                        'ReactionBatch': [{'data': {'repository': {'i1': reaction_node}}}],
+                    }),
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'MAX_COMMENT_REACTION_LOOKUPS': '1',
+                },
+            )
+            self.assertEqual(result.returncode, 0, result.stdout)
+            gh_calls = self._read_call_log('gh_calls.log')
+            (self.work / 'gh_calls.log').unlink()
+            return self._read_text('issue_report.txt'), gh_calls
+
+        report, gh_calls = run()
+        self.assertEqual(len([call for call in gh_calls if call[:2] == ['api', 'graphql']]), 1)
+        self.assertIn('giving 3 reactions', report)
+        cache_entry = json.loads((self.work / 'cache' / 'reactions' / 'comment_11.json').read_text(encoding='utf-8'))
+        self.assertEqual(cache_entry['reactions'], [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}])
+
+        # The cache hit costs one reaction batch instead of a REST lookup per comment, and nothing hits the cap.
+        report, gh_calls = run()
+        self.assertFalse(any(call[0] == 'api' and call[1] != 'graphql' for call in gh_calls))
+        graphql_calls = [call for call in gh_calls if call[:2] == ['api', 'graphql']]
+        self.assertEqual(len(graphql_calls), 1)
+        self.assertTrue(any('query ReactionBatch' in arg for arg in graphql_calls[0]))
+        self.assertIn('giving 4 reactions', report)
+
+    def test_issue_fetch_mode_view_skips_graphql(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [],
+        }
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                'ISSUE_FETCH_MODE': 'view',
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        gh_calls = self._read_call_log('gh_calls.log')
+        self.assertFalse(any(call[:2] == ['api', 'graphql'] for call in gh_calls))
+        self.assertTrue(any(call[:2] == ['issue', 'view'] for call in gh_calls))
+        report = self._read_text('issue_report.txt')
+        self.assertIn('Thank you for your 1 contributions on 1 issues', report)
+
+    def test_involves_scan_planner_scans_only_issues_found_for_tracked_assignees(self):
+        issues = [
+            {
+                'number': number,
+                'assignees': [{'login': login}],
+                'updatedAt': '2026-01-01T00:00:00Z',
+                'url': 'https://github.com/example/repo/issues/{}'.format(number),
+                'title': 'x',
+                'labels': [],
+            }
+            for number, login in ((1, 'alice'), (2, 'bob'))
+        ]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [],
+        }
+
+        def search(numbers, cursor=None):
+            return {'issueCount': 2, 'pageInfo': {'hasNextPage': bool(cursor), 'endCursor': cursor}, 'nodes': [{'number': n} for n in numbers]}
+
+        participant_responses = [
+            {'data': {'p0': search([5], cursor='next'), 'p1': search([3])}},
+            {'data': {'p0': search([4])}},
+        ]
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n2\n3\n4\n5\n',
+                'GH_GRAPHQL_RESPONSES_JSON': json.dumps({'ParticipantIssues': participant_responses}),
+                'GH_ISSUE_VIEWS_JSON': json.dumps({str(number): issue_view for number in range(1, 6)}),
+                'ISSUE_FETCH_MODE': 'view',
+                'ISSUE_SCAN_PLANNER': 'involves',
+            },
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn('Scan planner kept 3 of 5 recently updated issues.', result.stdout)
+        gh_calls = self._read_call_log('gh_calls.log')
+        self.assertEqual([call[2] for call in gh_calls if call[:2] == ['issue', 'view']], ['3', '4', '5'])
+        search_calls = [call for call in gh_calls if call[:2] == ['api', 'graphql']]
+        self.assertEqual(len(search_calls), 2)
+        self.assertIn('q0=repo:example/repo is:issue involves:alice updated:2026-02-03..2026-02-10', search_calls[0])
+        self.assertIn('q1=repo:example/repo is:issue involves:bob updated:2026-02-03..2026-02-10', search_calls[0])
+        self.assertIn('c0=next', search_calls[1])
+        self.assertFalse(any(arg.startswith('q1=') for arg in search_calls[1]))
+
+    def test_concurrent_gh_lookups_match_serial_report(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}, {'login': 'bob'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_views = {}
+        api_responses = {}
+        for issue_num in range(1, 9):
+            author = 'alice' if issue_num % 2 else 'bob'
+            issue_views[str(issue_num)] = {
+                'createdAt': '2026-02-09T00:00:00Z',
+                'author': {'login': author},
+                'reactionGroups': [{'content': 'THUMBS_UP', 'users': {'totalCount': 1}}],
+                'comments': [{
+                    'id': 100 + issue_num,
+                    'createdAt': '2026-02-09T01:00:00Z',
+                    'author': {'login': 'bob'},
+                    'reactionGroups': [{'content': 'HEART', 'users': {'totalCount': 1}}],
+                }],
+            }
+            api_responses['repos/example/repo/issues/{}/reactions'.format(issue_num)] = [
+                {'created_at': '2026-02-09T02:00:00Z', 'user': {'login': 'bob'}}
+            ]
+            api_responses['repos/example/repo/issues/comments/{}/reactions'.format(100 + issue_num)] = [
+                {'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}
+            ]
+        reports = []
+        for concurrency in ('1', '4'):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '\n'.join(str(n) for n in range(1, 9)) + '\n',
+                    'GH_ISSUE_VIEWS_JSON': json.dumps(issue_views),
+                    'GH_API_RESPONSES_JSON': json.dumps(api_responses),
+                    'GH_MAX_CONCURRENCY': concurrency,
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            reports.append(self._read_text('issue_report.txt'))
+        self.assertEqual(reports[0], reports[1])
+        self.assertIn('Thank you for your 4 contributions on 4 issues, writing in 0 wiki pages, and giving 8 reactions', reports[1])
+        self.assertIn('Thank you for your 12 contributions on 8 issues, writing in 0 wiki pages, and giving 8 reactions', reports[1])
+        gh_calls = self._read_call_log('gh_calls.log')
+        issue_view_calls = [call for call in gh_calls if call[:2] == ['issue', 'view']]
+        self.assertEqual(len(issue_view_calls), 16)
+
+    def test_issue_view_cache_skips_unchanged_issues(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [],
+        }
+
+        def run(listing):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': listing,
+                    'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view, '2': issue_view}),
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'ISSUE_FETCH_MODE': 'view',
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            self.assertIn('Thank you for your 2 contributions on 2 issues', self._read_text('issue_report.txt'))
+            calls = [call[2] for call in self._read_call_log('gh_calls.log') if call[:2] == ['issue', 'view']]
+            (self.work / 'gh_calls.log').unlink()
+            return calls
+
+        self.assertEqual(run('1\t2026-02-09T05:00:00Z\n2\t2026-02-09T06:00:00Z\n'), ['1', '2'])
+        self.assertTrue((self.work / 'cache' / 'issue_views' / '1.json').exists())
+        self.assertEqual(run('1\t2026-02-09T05:00:00Z\n2\t2026-02-09T06:00:00Z\n'), [])
+        self.assertEqual(run('1\t2026-02-09T05:00:00Z\n2\t2026-02-10T06:00:00Z\n'), ['2'])
+
+    def test_cached_issue_view_still_looks_up_reactions_added_since_it_was_cached(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [{'id': 900, 'createdAt': '2026-02-09T01:00:00Z', 'author': {'login': 'alice'}, 'reactionGroups': []}],
+        }
+        issue_endpoint = 'repos/example/repo/issues/1/reactions'
+        comment_endpoint = 'repos/example/repo/issues/comments/900/reactions'
+
+        def run(api_responses):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '1\t2026-02-09T05:00:00Z\n',
+                    'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                    'GH_API_RESPONSES_JSON': json.dumps(api_responses),
+                    'GH_API_ETAGS_JSON': json.dumps({issue_endpoint: '"etag-i"', comment_endpoint: '"etag-c"'}),
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'ISSUE_FETCH_MODE': 'view',
+                },
+            )
+            self.assertEqual(result.returncode, 0, result.stdout)
+            gh_calls = self._read_call_log('gh_calls.log')
+            (self.work / 'gh_calls.log').unlink()
+            return self._read_text('issue_report.txt'), gh_calls
+
+        # The freshly fetched payload shows no reactions, so nothing is looked up.
+        _, gh_calls = run({})
+        self.assertFalse(any(call[0] == 'api' for call in gh_calls))
+
+        # Reactions added later do not bump updatedAt; the cached payload is reused, but reactions are looked up.
+        reaction = [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}]
+        report, gh_calls = run({issue_endpoint: reaction, comment_endpoint: reaction})
+        self.assertFalse(any(call[:2] == ['issue', 'view'] for call in gh_calls))
+        self.assertEqual([call[1] for call in gh_calls if call[0] == 'api'], [issue_endpoint, comment_endpoint])
+        self.assertIn('giving 2 reactions', report)
+
+        # From then on the cached reaction lists are revalidated with their ETags.
+        report, gh_calls = run({})
+        api_calls = [call for call in gh_calls if call[0] == 'api']
+        self.assertEqual(len(api_calls), 2)
+        self.assertTrue(all(any(arg.startswith('If-None-Match:') for arg in call) for call in api_calls))
+        self.assertIn('giving 2 reactions', report)
+
+    def test_reaction_cache_revalidates_with_etag_and_bypasses_lookup_cap(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [],
+            'comments': [
+                {'id': 900, 'createdAt': '2026-02-09T01:00:00Z', 'author': {'login': 'alice'}, 'reactionGroups': [{'x': 1}]},
+            ],
+        }
+        endpoint = 'repos/example/repo/issues/comments/900/reactions'
+
+        def run(api_responses, max_lookups):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '1\n',
+                    'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                    'GH_API_RESPONSES_JSON': json.dumps(api_responses),
+                    'GH_API_ETAGS_JSON': json.dumps({endpoint: '"etag-1"'}),
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'MAX_COMMENT_REACTION_LOOKUPS': max_lookups,
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            self.assertIn('giving 1 reactions', self._read_text('issue_report.txt'))
+            calls = [call for call in self._read_call_log('gh_calls.log') if call[:2] == ['api', endpoint]]
+            (self.work / 'gh_calls.log').unlink()
+            return calls
+
+        first_calls = run({endpoint: [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}]}, '10')
+        self.assertEqual(len(first_calls), 1)
+        self.assertIn('-i', first_calls[0])
+        cache_entry = json.loads((self.work / 'cache' / 'reactions' / 'comment_900.json').read_text(encoding='utf-8'))
+        self.assertEqual(cache_entry['etag'], '"etag-1"')
+
+        # Unchanged reactions answer 304, and the cached list is counted even with the lookup cap at zero.
+        second_calls = run({}, '0')
+        self.assertEqual(len(second_calls), 1)
+        self.assertIn('If-None-Match: "etag-1"', second_calls[0])
+
+    def test_full_page_reaction_cache_entry_counts_toward_lookup_cap(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'bob'},
+            'reactionGroups': [],
+            'comments': [
+                {'id': 900, 'createdAt': '2026-02-09T01:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': [{'x': 1}]},
+            ],
+        }
+        # A full page is fetched again in full rather than revalidated, so it is not free against the cap.
+        cache_path = self.work / 'cache' / 'reactions' / 'comment_900.json'
+        cache_path.parent.mkdir(parents=True)
+        reactions = [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}] * 30
+        cache_path.write_text(json.dumps({'etag': '"etag-1"', 'reactions': reactions}), encoding='utf-8')
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                'ISSUE_FETCH_MODE': 'view',
+                'MAX_COMMENT_REACTION_LOOKUPS': '0',
+            },
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn('Reached comment reaction lookup limit (0)', result.stdout)
+        self.assertFalse(any(call[0] == 'api' for call in self._read_call_log('gh_calls.log')))
+        self.assertIn('giving 30 reactions', self._read_text('issue_report.txt'))
+
+    def test_incremental_report_reuses_state_for_unchanged_issues_and_wiki(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [{'x': 1}],
+            'comments': [],
+        }
+        endpoint = 'repos/example/repo/issues/1/reactions'
+        reaction = {'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}
+
+        def run(git_log_output, reactions=(reaction,), etag='"etag-1"'):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '1\t2026-02-09T05:00:00Z\n',
+                    'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                    'GH_API_RESPONSES_JSON': json.dumps({endpoint: list(reactions)}),
+                    'GH_API_ETAGS_JSON': json.dumps({endpoint: etag}),
+                    'ISSUE_FETCH_MODE': 'view',
+                    'INCREMENTAL_REPORT': 'yes',
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'GIT_CLONE_EXIT': '0',
+                    'GIT_LOG_EXIT': '0',
+                    'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            report = self._read_text('issue_report.txt')
+            gh_calls = self._read_call_log('gh_calls.log')
+            git_calls = self._read_call_log('git_calls.log')
+            (self.work / 'gh_calls.log').unlink()
+            (self.work / 'git_calls.log').unlink()
+            return report, gh_calls, git_calls
+
+        first_report, first_gh_calls, _ = run(wiki_log_z(('abc123', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'edit', [('M', 'My-Page.md')])))
+        self.assertTrue(any(call[0] == 'api' for call in first_gh_calls))
+        self.assertIn('**[My Page](', first_report)
+
+        # Nothing changed upstream: the issue is not fetched again, its reactions are only revalidated with
+        # their ETag, and the wiki log only covers commits after the stored one.
+        second_report, second_gh_calls, second_git_calls = run(b'')
+        self.assertFalse(any(call[:2] == ['issue', 'view'] for call in second_gh_calls))
+        api_calls = [call for call in second_gh_calls if call[0] == 'api']
+        self.assertEqual(len(api_calls), 1)
+        self.assertIn('If-None-Match: "etag-1"', api_calls[0])
+        log_calls = [call for call in second_git_calls if call[2:3] == ['log']]
+        self.assertEqual(len(log_calls), 1)
+        self.assertIn('abc123..HEAD', log_calls[0])
+        self.assertEqual(second_report, first_report)
+
+        # A reaction added since does not change updatedAt, but it is still counted.
+        added_reaction = {'created_at': '2026-02-10T01:00:00Z', 'user': {'login': 'alice'}}
+        third_report, third_gh_calls, _ = run(b'', reactions=(reaction, added_reaction), etag='"etag-2"')
+        self.assertFalse(any(call[:2] == ['issue', 'view'] for call in third_gh_calls))
+        self.assertIn('giving 2 reactions', third_report)
+
+    def test_incremental_report_refreshes_reused_issue_reactions_without_spending_the_lookup_cap(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        thumbs_up = [{'content': 'THUMBS_UP', 'users': {'totalCount': 1}}]
+        reactions = {'pageInfo': {'hasNextPage': False}, 'nodes': [{'createdAt': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}]}
+        comment_ids = (11, 12, 13)
+        issue_node = {
+            'number': 1,
+            'createdAt': '2026-02-01T00:00:00Z',
+            'author': {'login': 'bob'},
+            'labels': {'nodes': []},
+            'reactionGroups': thumbs_up,
+            'reactions': reactions,
+            'comments': {
+                'pageInfo': {'hasNextPage': False, 'endCursor': None},
+                'nodes': [
+                    {'databaseId': comment_id, 'createdAt': '2026-02-01T01:00:00Z', 'author': {'login': 'bob'}, 'reactionGroups': thumbs_up, 'reactions': reactions}
+                    for comment_id in comment_ids
+                ],
+            },
+        }
+        reaction_node = {
+            'reactions': reactions,
+            'comments': {'nodes': [{'databaseId': comment_id, 'reactions': reactions} for comment_id in comment_ids]},
+        }
+
+        def run():
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_OUTPUT': '1\t2026-02-09T05:00:00Z\n',
+                    'GH_GRAPHQL_RESPONSES_JSON': json.dumps({
+                        'IssueBatch': [{'data': {'repository': {'i1': issue_node}}}],
+                        'ReactionBatch': [{'data': {'repository': {'i1': reaction_node}}}],
+                    }),
+                    'INCREMENTAL_REPORT': 'yes',
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'MAX_COMMENT_REACTION_LOOKUPS': '1',
+                },
+            )
+            self.assertEqual(result.returncode, 0, result.stdout)
+            gh_calls = self._read_call_log('gh_calls.log')
+            (self.work / 'gh_calls.log').unlink()
+            return result.stdout, self._read_text('issue_report.txt'), gh_calls
+
+        _, first_report, _ = run()
+        self.assertIn('giving 4 reactions', first_report)
+        # The reused issue costs one reaction batch; no comment is looked up over REST, so the cap of 1 is never
+        # reached and the issue stays in the state for the run after.
+        for _ in range(2):
+            stdout, report, gh_calls = run()
+            self.assertIn('Incremental state reused for 1 of 1 issues', stdout)
+            self.assertNotIn('Reached comment reaction lookup limit', stdout)
+            self.assertEqual([call[:2] for call in gh_calls if call[0] == 'api'], [['api', 'graphql']])
+            self.assertEqual(report, first_report)
+
+    def test_streamed_wiki_log_keeps_page_updates_and_newest_commit(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+
+        def run(git_log_output):
+            result = self._run_script(
+                json.dumps(issues),
+                extra_env={
+                    'GH_ISSUE_LIST_EXIT': '1',
+                    'INCREMENTAL_REPORT': 'yes',
+                    'REPORT_CACHE_DIR': str(self.work / 'cache'),
+                    'GIT_CLONE_EXIT': '0',
+                    'GIT_LOG_EXIT': '0',
+                    'GIT_LOG_OUTPUT_FILE': self._write_git_log(git_log_output),
+                },
+            )
+            self.assertEqual(result.returncode, 0)
+            git_calls = self._read_call_log('git_calls.log')
+            (self.work / 'git_calls.log').unlink()
+            return self._read_text('issue_report.txt'), git_calls
+
+        # The newest commit touches no page, but it is still where the next run resumes.
+        git_log_output = wiki_log_z(
+            ('def456', 'alice@users.noreply.github.com', 'alice', '2026-02-10', 'cleanup', [('D', 'Old-Page.md'), ('M', '_Sidebar.txt')]),
+            ('abc123', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'edit', [('M', 'My-Page.md')]),
+        )
+        report, _ = run(git_log_output)
+        self.assertIn('**[My Page](', report)
+        self.assertNotIn('Old Page', report)
+        self.assertIn('writing in 1 wiki pages', report)
+
+        _, git_calls = run(b'')
+        log_calls = [call for call in git_calls if call[2:3] == ['log']]
+        self.assertEqual(len(log_calls), 1)
+        self.assertIn('def456..HEAD', log_calls[0])
+
+    def test_report_metrics_count_commands_per_category_and_phase(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [{'x': 1}],
+            'comments': [],
+        }
+        summary_path = self.work / 'step_summary.md'
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                'GH_API_RESPONSES_JSON': json.dumps({'repos/example/repo/issues/1/reactions': []}),
+                'GITHUB_STEP_SUMMARY': str(summary_path),
+                'REPORT_STEP_SUMMARY': 'yes',
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        metrics = json.loads(self._read_text('report_metrics.json'))
+        self.assertEqual(
+            list(metrics['phases_sec']),
+            ['ingest', 'issue_listing', 'issue_scan', 'reaction_lookups', 'wiki', 'rendering'],
+        )
+        commands = metrics['commands']
+        # No GraphQL response is stubbed, so the batch fails and the issue is fetched with gh issue view.
+        self.assertEqual((commands['issue_batch_graphql']['count'], commands['issue_batch_graphql']['failures']), (1, 1))
+        self.assertEqual((commands['issue_view']['count'], commands['issue_view']['failures']), (1, 0))
+        self.assertEqual(commands['issue_reactions']['count'], 1)
+        self.assertEqual(commands['git_clone']['failure_rate'], 1.0)
+        self.assertEqual(sum(commands['issue_list']['histogram_sec'].values()), 1)
+        self.assertIn('| issue_view | 1 | 0 |', summary_path.read_text(encoding='utf-8'))
+
+    def test_rate_limited_reaction_lookup_is_retried(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [{'x': 1}],
+            'comments': [],
+        }
+        endpoint = 'repos/example/repo/issues/1/reactions'
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'ISSUE_FETCH_MODE': 'view',
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                'GH_API_RESPONSES_JSON': json.dumps({endpoint: [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}]}),
+                'GH_API_RATE_LIMITED_JSON': json.dumps({endpoint: 2}),
+                'GH_RETRY_BASE_DELAY_MS': '0',
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.count('GitHub rate limit hit (issue_reactions)'), 2)
+        self.assertNotIn('Could not fetch reactions', result.stdout)
+        self.assertIn('giving 1 reactions', self._read_text('issue_report.txt'))
+        reaction_calls = [call for call in self._read_call_log('gh_calls.log') if call[:2] == ['api', endpoint]]
+        self.assertEqual(len(reaction_calls), 3)
+
+    def test_scarce_rate_limit_budget_defers_comment_reactions_to_issue_reactions(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        issue_view = {
+            'createdAt': '2026-02-09T00:00:00Z',
+            'author': {'login': 'alice'},
+            'reactionGroups': [{'x': 1}],
+            'comments': [
+                {'id': 900, 'createdAt': '2026-02-09T01:00:00Z', 'author': {'login': 'alice'}, 'reactionGroups': [{'x': 1}]},
+            ],
+        }
+        reaction = [{'created_at': '2026-02-09T03:00:00Z', 'user': {'login': 'alice'}}]
+        result = self._run_script(
+            json.dumps(issues),
+            extra_env={
+                'GH_ISSUE_LIST_OUTPUT': '1\n',
+                'ISSUE_FETCH_MODE': 'view',
+                'GH_ISSUE_VIEWS_JSON': json.dumps({'1': issue_view}),
+                'GH_API_RESPONSES_JSON': json.dumps({
+                    'repos/example/repo/issues/1/reactions': reaction,
+                    'repos/example/repo/issues/comments/900/reactions': reaction,
+                }),
+                'GH_API_RATE_LIMIT_REMAINING': '5',
+                'GH_RATE_LIMIT_RESERVE': '10',
+            },
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('Could not fetch reactions for comment 900: skipped to keep the last 10 API requests', result.stdout)
+        api_calls = [call[1] for call in self._read_call_log('gh_calls.log') if call[0] == 'api']
+        self.assertEqual(api_calls, ['repos/example/repo/issues/1/reactions'])
+        self.assertIn('giving 1 reactions', self._read_text('issue_report.txt'))
+
+    def test_shallow_wiki_clone_and_cached_mirror_fetch(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        extra_env = {
+            'GH_ISSUE_LIST_EXIT': '1',
+            'GIT_CLONE_EXIT': '0',
+            'GIT_LOG_EXIT': '0',
+        }
+        extra_env['GIT_LOG_OUTPUT_FILE'] = self._write_git_log(
+            wiki_log_z(('abc123', 'alice@users.noreply.github.com', 'alice', '2026-02-09', 'edit', [('M', 'My-Page.md')]))
+        )
+        result = self._run_script(json.dumps(issues), extra_env=extra_env)
+        self.assertEqual(result.returncode, 0)
+        git_calls = self._read_call_log('git_calls.log')
+        self.assertEqual(
+            git_calls[0],
+            ['clone', 'https://github.com/example/repo.wiki.git', '--mirror', '--filter=blob:none', '--shallow-since=2026-02-02', 'wiki_temp'],
+        )
+        self.assertEqual(git_calls[1], ['-C', 'wiki_temp', 'fetch', '--deepen=1', 'origin'])
+        self.assertIn('**[My Page](', self._read_text('issue_report.txt'))
+
+        # The cached mirror has no work tree, so it is fetched rather than pulled.
+        (self.work / 'git_calls.log').unlink()
+        result = self._run_script(json.dumps(issues), extra_env=extra_env)
+        self.assertEqual(result.returncode, 0)
+        git_calls = self._read_call_log('git_calls.log')
+        self.assertIn(['-C', 'wiki_temp', 'fetch', '--prune', 'origin'], git_calls)
+        self.assertFalse(any(call[:1] == ['clone'] or call[2:3] == ['pull'] for call in git_calls))
+
+    def test_partial_wiki_mirror_log_needs_no_blobs_from_unreachable_origin(self):
+        issues = [{
+            'number': 1,
+            'assignees': [{'login': 'alice'}],
+            'updatedAt': '2026-01-01T00:00:00Z',
+            'url': 'https://github.com/example/repo/issues/1',
+            'title': 'x',
+            'labels': [],
+        }]
+        (self.bin_dir / 'git').unlink()
+        source = Path(self.tmpdir.name) / 'wiki_source'
+
+        def git(*args, date=None, cwd=source):
+            env = dict(os.environ, GIT_AUTHOR_NAME='alice', GIT_AUTHOR_EMAIL='alice@example.com',
+                       GIT_COMMITTER_NAME='alice', GIT_COMMITTER_EMAIL='alice@example.com')
+            if date:
+                env.update(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+            subprocess.run(['git'] + list(args), cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        source.mkdir()
+        git('init', '-q')
+        git('config', 'uploadpack.allowFilter', 'true')
+        (source / 'Old-Page.md').write_text('one\ntwo\nthree\nfour\n', encoding='utf-8')
+        git('add', '-A')
+        git('commit', '-qm', 'add', date='2026-02-01T12:00:00')
+        git('mv', 'Old-Page.md', 'New-Page.md')
+        with (source / 'New-Page.md').open('a', encoding='utf-8') as fh:
+            fh.write('five\n')
+        git('commit', '-qam', 'rename and edit', date='2026-02-08T12:00:00')
+        git('clone', '-q', '--mirror', '--filter=blob:none', source.as_uri(), 'wiki_temp', cwd=self.work)
+        # The cached mirror outlives access to its origin, as after the token is removed from the remote URL.
+        shutil.rmtree(source)
+
+        result = self._run_script(json.dumps(issues), extra_env={'GH_ISSUE_LIST_EXIT': '1'})
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn('Could not update wiki repository', result.stdout)
+        self.assertNotIn('Could not get wiki git log', result.stdout)
+        report = self._read_text('issue_report.txt')
+        self.assertIn('**[New Page](', report)
+        self.assertNotIn('Old Page', report)
 
 if __name__ == '__main__':
     unittest.main()